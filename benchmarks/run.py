@@ -0,0 +1,189 @@
+"""Benchmarks of the generation throughput and peak memory of representative `Rsg`
+configurations.
+
+Usage::
+
+    python benchmarks/run.py                          # run and print the results
+    python benchmarks/run.py --save baseline.json     # store a baseline
+    python benchmarks/run.py --baseline baseline.json # flag regressions
+
+The exit code is 1 if any regression is found.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from rsg.core import (  # noqa: E402
+    Rsg,
+    RsgBase,
+    RsgDict,
+    RsgInt,
+    RsgList,
+    generator,
+)
+
+
+def _make_wide_mixin(n: int) -> type:
+    # A mixin with n leaf generator methods and one composite.
+    def _leaf(i: int) -> Any:
+        return generator(f"leaf_{i}")(lambda self: i)
+
+    namespace = {f"_generate_leaf_{i}": _leaf(i) for i in range(n)}
+    return type("RsgWide", (RsgList,), namespace)
+
+
+RsgWide = _make_wide_mixin(100)
+
+
+class RsgIntDict(RsgInt, RsgDict):
+    pass
+
+
+# name -> factory of the benchmarked Rsg
+CONFIGS: dict[str, Callable[[], Rsg]] = {
+    "flat_int": lambda: RsgInt(seed=0),
+    "deep_list": lambda: RsgList(
+        seed=0, min_depth=8, max_depth=12, min_breadth=1, max_breadth=2
+    ),
+    "wide_base": lambda: RsgBase(
+        seed=0, min_depth=1, max_depth=3, min_breadth=4, max_breadth=12
+    ),
+    "dict_long_keys": lambda: RsgIntDict(
+        seed=0,
+        min_depth=1,
+        max_depth=3,
+        min_breadth=2,
+        max_breadth=6,
+        min_key_len=32,
+        max_key_len=64,
+    ),
+    "wide_mixin": lambda: RsgWide(
+        seed=0, min_depth=1, max_depth=3, min_breadth=2, max_breadth=6
+    ),
+}
+
+
+def count_nodes(data: Any) -> int:
+    stack, n = [data], 0
+    while stack:
+        x = stack.pop()
+        n += 1
+        if isinstance(x, dict):
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple)):
+            stack.extend(x)
+    return n
+
+
+def bench(factory: Callable[[], Rsg], duration: float, batch: int) -> dict[str, float]:
+    """Benchmarks an `Rsg` configuration.
+
+    Args:
+        factory (Callable[[], Rsg]): Factory of the benchmarked `Rsg`.
+        duration (float): Minimum duration of the throughput measurement, in seconds.
+        batch (int): Number of structures generated per timed batch.
+
+    Returns:
+        dict[str, float]: Structures/sec, nodes/sec and peak memory per batch.
+    """
+    rsg = factory()
+    structures, nodes, elapsed = 0, 0, 0.0
+    while elapsed < duration:
+        t0 = time.perf_counter()
+        data = rsg.generate_many(batch)
+        elapsed += time.perf_counter() - t0
+        structures += batch
+        nodes += sum(count_nodes(x) for x in data)
+
+    rsg = factory()
+    tracemalloc.start()
+    data = rsg.generate_many(batch)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "structures_per_sec": structures / elapsed,
+        "nodes_per_sec": nodes / elapsed,
+        "peak_bytes": peak,
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Compares results against a baseline.
+
+    Args:
+        results (dict[str, dict[str, float]]): The benchmark results.
+        baseline (dict[str, dict[str, float]]): The baseline results.
+        tolerance (float): Allowed relative slowdown or memory increase.
+
+    Returns:
+        list[str]: The description of every regression found.
+    """
+    regressions = []
+    for name, res in results.items():
+        ref = baseline.get(name)
+        if ref is None:
+            continue
+        for key in ("structures_per_sec", "nodes_per_sec"):
+            if res[key] < ref[key] * (1 - tolerance):
+                regressions.append(
+                    f"{name}: {key} {res[key]:.0f} < baseline {ref[key]:.0f}"
+                )
+        if res["peak_bytes"] > ref["peak_bytes"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: peak_bytes {res['peak_bytes']} > "
+                f"baseline {ref['peak_bytes']}"
+            )
+    return regressions
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--select", nargs="*", help="Configurations to run")
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--save", type=Path, help="Save the results as baseline")
+    parser.add_argument("--baseline", type=Path, help="Baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    names = args.select or list(CONFIGS)
+    results = {}
+    print(f"{'config':<16}{'structures/s':>14}{'nodes/s':>14}{'peak KiB':>12}")
+    for name in names:
+        res = bench(CONFIGS[name], args.duration, args.batch)
+        results[name] = res
+        print(
+            f"{name:<16}{res['structures_per_sec']:>14.0f}"
+            f"{res['nodes_per_sec']:>14.0f}{res['peak_bytes'] / 1024:>12.1f}"
+        )
+
+    if args.save is not None:
+        meta = {"python": platform.python_version(), "machine": platform.machine()}
+        args.save.write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for x in regressions:
+            print(f"REGRESSION {x}")
+        return int(len(regressions) > 0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
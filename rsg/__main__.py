@@ -0,0 +1,5 @@
+import sys
+
+from rsg.cli import main
+
+sys.exit(main())
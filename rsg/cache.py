@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from pathlib import Path
+from types import CodeType
+from typing import Any, Optional, Union
+
+from rsg import __version__
+from rsg.columnar import COLUMNS, Columnar, to_columnar
+from rsg.core import Rsg, _GeneratorFn
+
+_MAGIC = b"RSGC"
+_FORMAT_VERSION = 2
+# Magic, format version and length of the JSON section table.
+_HEADER = struct.Struct("<4sIQ")
+_ALIGN = 8
+_SUFFIX = ".rsgc"
+
+
+def _const_repr(const: Any) -> str:
+    # Nested code objects are replaced by their digest, their repr holds an address,
+    # and sets are sorted, their order depends on the hash seed of the process.
+    if isinstance(const, CodeType):
+        return _code_digest(const).hex()
+    if isinstance(const, tuple):
+        return "(" + ",".join(_const_repr(c) for c in const) + ")"
+    if isinstance(const, frozenset):
+        return "{" + ",".join(sorted(_const_repr(c) for c in const)) + "}"
+    return repr(const)
+
+
+def _code_digest(code: CodeType) -> bytes:
+    # Digest of a code object which is stable across processes.
+    h = hashlib.blake2b(digest_size=16)
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    h.update(_const_repr(code.co_consts).encode())
+    return h.digest()
+
+
+def _class_digest(cls: type) -> bytes:
+    # Digest of the code of every method defined along the MRO, so that helpers
+    # called by the generator methods, such as `_generate_key`, are covered as well.
+    h = hashlib.blake2b(digest_size=16)
+    for klass in cls.__mro__[:-1]:
+        h.update(f"{klass.__module__}.{klass.__qualname__}".encode())
+        for name, attr in sorted(vars(klass).items()):
+            if isinstance(attr, _GeneratorFn):
+                attr = attr.method
+            elif isinstance(attr, (staticmethod, classmethod)):
+                attr = attr.__func__
+            elif isinstance(attr, property):
+                attr = attr.fget
+            code = getattr(attr, "__code__", None)
+            if isinstance(code, CodeType):
+                h.update(name.encode())
+                h.update(_code_digest(code))
+                h.update(_const_repr(attr.__defaults__).encode())
+    return h.digest()
+
+
+def corpus_key(rsg: Rsg, n: int) -> str:
+    """Computes the cache key of a corpus, from the code of every method of the class
+    and its bases, the configuration and the root seed of an `Rsg`, and the number of
+    objects.
+
+    Args:
+        rsg (Rsg): The generator.
+        n (int): The number of objects.
+
+    Returns:
+        str: The hexadecimal cache key.
+
+    Raises:
+        ValueError: If the `Rsg` has a hook, which may alter the output.
+    """
+    config = rsg.config
+    if config.pop("hook") is not None:
+        raise ValueError("Corpora of an Rsg with a hook cannot be cached")
+
+    h = hashlib.blake2b(digest_size=16)
+    cls = rsg.__class__
+    h.update(f"{__version__}:{_FORMAT_VERSION}:{n}:{rsg.root_seed}".encode())
+    h.update(_class_digest(cls))
+    for name, fn in sorted(cls._generators_map.items()):
+        h.update(f"{name}:{fn.default_chance!r}".encode())
+    h.update(repr(sorted(config.items())).encode())
+    return h.hexdigest()
+
+
+def _write(path: Path, data: Columnar) -> None:
+    # Writes the columns to a temporary file, then atomically moves it to `path`.
+    sections, blobs, offset = {}, [], 0
+    for name, column in data.columns().items():
+        blob = memoryview(column).cast("B")
+        sections[name] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob) + (-len(blob) % _ALIGN)
+    objects = pickle.dumps(data.objects)
+    sections["objects"] = [offset, len(objects)]
+    blobs.append(objects)
+
+    table = json.dumps(sections).encode()
+    table += b" " * (-(_HEADER.size + len(table)) % _ALIGN)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(table)))
+            fp.write(table)
+            for blob in blobs:
+                fp.write(blob)
+                fp.write(b"\0" * (-len(blob) % _ALIGN))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _read(path: Path) -> Columnar:
+    # Memory maps a corpus file, columns are zero-copy views of the mapping.
+    with open(path, "rb") as fp:
+        buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, table_len = _HEADER.unpack_from(buf)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        raise ValueError(f"{path} is not a corpus file of format {_FORMAT_VERSION}")
+    start = _HEADER.size + table_len
+    sections = json.loads(bytes(buf[_HEADER.size : start]))
+
+    view = memoryview(buf)
+    columns = {}
+    for name, typecode in COLUMNS.items():
+        offset, size = sections[name]
+        columns[name] = view[start + offset : start + offset + size].cast(typecode)
+    offset, size = sections["objects"]
+    objects = pickle.loads(view[start + offset : start + offset + size])
+    return Columnar.from_columns(columns, objects)
+
+
+class CorpusCache:
+    """Bounded on-disk cache of generated corpora. A corpus is generated once in
+    columnar form and stored in a compact binary file, later requests memory map the
+    file and decode the objects lazily. When the cache exceeds its size, the least
+    recently used corpora are evicted.
+
+    Example:
+        Load a fixture corpus, generating it only on the first run::
+
+            cache = CorpusCache(".rsgcache", max_bytes=2**30)
+            corpus = cache.get(RsgBase(seed=42, max_depth=3), 1000000)
+            corpus[123]
+    """
+
+    def __init__(
+        self, directory: Union[str, Path, None] = None, max_bytes: int = 2**30
+    ) -> None:
+        """Constructor for `CorpusCache`.
+
+        Args:
+            directory (Union[str, Path, None], optional): The cache directory, created
+            if missing. If None, defaults to the `RSG_CACHE_DIR` environment variable
+            or to `~/.cache/rsg`. Defaults to None.
+            max_bytes (int, optional): Maximum total size of the cached files, in
+            bytes. Defaults to 1 GiB.
+        """
+        if directory is None:
+            directory = os.environ.get("RSG_CACHE_DIR", Path.home() / ".cache" / "rsg")
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+
+    @property
+    def directory(self) -> Path:
+        """The cache directory."""
+        return self._directory
+
+    @property
+    def max_bytes(self) -> int:
+        """Maximum total size of the cached files, in bytes."""
+        return self._max_bytes
+
+    def path(self, rsg: Rsg, n: int) -> Path:
+        """Returns the path of the file of a corpus, which may not exist.
+
+        Args:
+            rsg (Rsg): The generator.
+            n (int): The number of objects.
+
+        Returns:
+            Path: The path of the corpus file.
+        """
+        return self._directory / f"{corpus_key(rsg, n)}{_SUFFIX}"
+
+    def get(self, rsg: Rsg, n: int) -> Columnar:
+        """Returns the corpus of `n` objects generated by a fresh copy of an `Rsg`,
+        with the same configuration and root seed. The state of `rsg` is not used,
+        so equal requests always return the same corpus.
+
+        Args:
+            rsg (Rsg): The generator.
+            n (int): The number of objects.
+
+        Returns:
+            Columnar: The corpus, backed by a read-only memory mapped file.
+        """
+        path = self.path(rsg, n)
+        if path.exists():
+            os.utime(path)
+            return _read(path)
+
+        fresh = rsg.__class__(seed=rsg.root_seed, **rsg.config)
+        _write(path, to_columnar(fresh, n))
+        self.evict(keep=path)
+        return _read(path)
+
+    def evict(self, keep: Optional[Path] = None) -> None:
+        """Deletes the least recently used corpora until the cache fits in its size.
+
+        Args:
+            keep (Optional[Path], optional): A file that is never deleted. Defaults to
+            None.
+        """
+        files = []
+        for path in self._directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # pragma: no cover
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(x[1] for x in files)
+        for _, size, path in sorted(files):
+            if total <= self._max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:  # pragma: no cover
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        """Deletes all the cached corpora."""
+        for path in self._directory.glob(f"*{_SUFFIX}"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,259 @@
+"""Generate random structures in bulk, streaming them to sharded JSON Lines or YAML
+files.
+
+Usage::
+
+    rsg rsg.core:RsgBase -n 1000000 --seed 42 -p max_depth=3 max_breadth=8 -o out/
+    python -m rsg mypackage.generators:RsgMessages -n 100000 --format yaml
+    rsg rsg.core:RsgBase -n 100000 --workers 8 --stats stats.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, TextIO
+
+from rsg.core import Rsg
+from rsg.parallel import _chunks, generate_parallel
+from rsg.stats import StatsCollector
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover
+    yaml = None
+
+_EXTENSIONS = {"jsonl": "jsonl", "yaml": "yaml"}
+
+
+def load_class(path: str) -> type:
+    """Imports an `Rsg` subclass from its path.
+
+    Args:
+        path (str): The path of the class, either "module:Class" or "module.Class".
+
+    Raises:
+        ValueError: If the path does not refer to an `Rsg` subclass.
+
+    Returns:
+        type: The `Rsg` subclass.
+    """
+    module, sep, name = path.partition(":")
+    if not sep:
+        module, _, name = path.rpartition(".")
+    obj = importlib.import_module(module)
+    for part in name.split("."):
+        obj = getattr(obj, part, None)
+    if not (isinstance(obj, type) and issubclass(obj, Rsg)):
+        raise ValueError(f"{path} is not an Rsg subclass")
+    return obj
+
+
+def parse_params(params: Iterable[str]) -> dict[str, Any]:
+    """Parses constructor arguments given as "key=value" strings. Values are parsed as
+    Python literals, or kept as strings if they are not valid literals.
+
+    Args:
+        params (Iterable[str]): The arguments.
+
+    Raises:
+        ValueError: If an argument is not in the "key=value" form.
+
+    Returns:
+        dict[str, Any]: The parsed arguments.
+    """
+    res = {}
+    for param in params:
+        key, sep, value = param.partition("=")
+        if not sep or not key:
+            raise ValueError(f"Invalid parameter {param!r}, expected key=value")
+        try:
+            res[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            res[key] = value
+    return res
+
+
+def _positive_int(value: str) -> int:
+    # Argument type of counts and sizes.
+    res = int(value)
+    if res < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return res
+
+
+def _to_builtin(obj: Any) -> Any:
+    # Tuples become lists and unknown objects their repr, for the yaml safe dumper.
+    if isinstance(obj, dict):
+        return {str(k): _to_builtin(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_builtin(x) for x in obj]
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    return repr(obj)
+
+
+def encode(obj: Any, fmt: str) -> bytes:
+    """Encodes an object as a JSON line or as a YAML document.
+
+    Args:
+        obj (Any): The object.
+        fmt (str): The format, either "jsonl" or "yaml".
+
+    Returns:
+        bytes: The utf-8 encoded object.
+    """
+    if fmt == "jsonl":
+        return (json.dumps(obj, default=repr) + "\n").encode()
+    return yaml.safe_dump(
+        _to_builtin(obj), explicit_start=True, allow_unicode=True, sort_keys=False
+    ).encode()
+
+
+class ShardWriter:
+    """Writes encoded objects to a sequence of files with a fixed number of objects
+    each, named `{prefix}-{index:05d}.{extension}`.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        prefix: str,
+        fmt: str,
+        shard_size: int,
+        buffer_size: int = 1 << 20,
+    ) -> None:
+        """Constructor for `ShardWriter`.
+
+        Args:
+            directory (Path): The output directory, created if missing.
+            prefix (str): The prefix of the file names.
+            fmt (str): The format, either "jsonl" or "yaml".
+            shard_size (int): The number of objects per file.
+            buffer_size (int, optional): The write buffer size of every file, in bytes.
+            Defaults to 1 MiB.
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._prefix = prefix
+        self._fmt = fmt
+        self._shard_size = shard_size
+        self._buffer_size = buffer_size
+        self._fp: Optional[BinaryIO] = None
+        self.paths: list[Path] = []
+        self.objects = 0
+        self.bytes = 0
+
+    def write(self, obj: Any) -> None:
+        """Writes an object, opening a new file if the current one is full.
+
+        Args:
+            obj (Any): The object.
+        """
+        if self.objects % self._shard_size == 0:
+            self.close()
+            name = f"{self._prefix}-{len(self.paths):05d}.{_EXTENSIONS[self._fmt]}"
+            path = self._directory / name
+            self._fp = open(path, "wb", buffering=self._buffer_size)
+            self.paths.append(path)
+        data = encode(obj, self._fmt)
+        self._fp.write(data)
+        self.objects += 1
+        self.bytes += len(data)
+
+    def close(self) -> None:
+        """Closes the current file."""
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def __enter__(self) -> ShardWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _generate(rsg: Rsg, n: int, workers: int, chunksize: int) -> Iterator[Any]:
+    # Same chunks as `generate_parallel`, so the output does not depend on `workers`.
+    if workers > 1:
+        return generate_parallel(rsg, n, workers=workers, chunksize=chunksize)
+    return (
+        x
+        for i, size in _chunks(n, chunksize)
+        for x in rsg.substream(i).generate_many(size)
+    )
+
+
+def _report(writer: ShardWriter, elapsed: float, fp: TextIO, end: str) -> None:
+    rate = writer.objects / elapsed if elapsed > 0 else 0.0
+    fp.write(
+        f"\r{writer.objects} structures, {rate:.0f} structures/s, "
+        f"{writer.bytes / 2**20:.1f} MiB written, {len(writer.paths)} shard(s){end}"
+    )
+    fp.flush()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    description = " ".join(__doc__.split("\n\n")[0].split())
+    parser = argparse.ArgumentParser(prog="rsg", description=description)
+    parser.add_argument("cls", help="The Rsg subclass, as module:Class")
+    parser.add_argument(
+        "-n", type=_positive_int, default=1000, help="Number of structures"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Root seed")
+    parser.add_argument(
+        "-p", "--params", nargs="*", default=[], help="Constructor arguments, key=value"
+    )
+    parser.add_argument("-o", "--output", type=Path, default=Path("."))
+    parser.add_argument("--prefix", default="rsg", help="Prefix of the file names")
+    parser.add_argument("--format", choices=sorted(_EXTENSIONS), default="jsonl")
+    parser.add_argument("--shard-size", type=_positive_int, default=100000)
+    parser.add_argument("--workers", type=_positive_int, default=1)
+    parser.add_argument("--chunksize", type=_positive_int, default=1000)
+    parser.add_argument(
+        "--report-every", type=float, default=1.0, help="Seconds between reports"
+    )
+    parser.add_argument(
+        "--stats", type=Path, default=None, help="Write statistics to a JSON file"
+    )
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.format == "yaml" and yaml is None:
+        parser.error(
+            "The yaml format requires PyYAML, install it with `pip install pyyaml`"
+        )
+    try:
+        cls = load_class(args.cls)
+        params = parse_params(args.params)
+    except (ImportError, ValueError) as e:
+        parser.error(str(e))
+    for name in ("seed", "rng", "hook"):
+        if name in params:
+            parser.error(f"{name} cannot be given with -p, see --seed and --stats")
+
+    stats = None if args.stats is None else StatsCollector(seed=args.seed)
+    try:
+        rsg = cls(seed=args.seed, hook=stats, **params)
+    except (AttributeError, TypeError, ValueError) as e:
+        parser.error(f"Cannot create {args.cls}: {e}")
+    start = last = time.perf_counter()
+    with ShardWriter(args.output, args.prefix, args.format, args.shard_size) as writer:
+        for obj in _generate(rsg, args.n, args.workers, args.chunksize):
+            writer.write(obj)
+            if not args.quiet and writer.objects % 100 == 0:
+                now = time.perf_counter()
+                if now - last >= args.report_every:
+                    _report(writer, now - start, sys.stderr, "")
+                    last = now
+    if not args.quiet:
+        _report(writer, time.perf_counter() - start, sys.stderr, "\n")
+    if stats is not None:
+        args.stats.write_text(json.dumps(stats.summary(), indent=2) + "\n")
+    return 0
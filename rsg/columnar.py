@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from array import array
+from enum import IntEnum
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from rsg.core import Rsg
+from rsg.events import Event, EventType, iter_events
+
+
+class NodeKind(IntEnum):
+    """Kinds of the nodes of a `Columnar` encoding."""
+
+    LIST = 0
+    TUPLE = 1
+    DICT = 2
+    INT = 3
+    FLOAT = 4
+    STR = 5
+    OBJECT = 6
+
+
+_START_KINDS = {
+    EventType.START_LIST: NodeKind.LIST,
+    EventType.START_TUPLE: NodeKind.TUPLE,
+    EventType.START_DICT: NodeKind.DICT,
+}
+_END_EVENTS = {EventType.END_LIST, EventType.END_TUPLE, EventType.END_DICT}
+_INT_MIN, _INT_MAX = -(2**63), 2**63 - 1
+
+# name -> typecode of every column and buffer of a `Columnar`. Indices and offsets are
+# unsigned 32-bit integers, which bounds an encoding to 2**32 nodes and string bytes.
+COLUMNS = {
+    "kinds": "B",
+    "sizes": "I",
+    "offsets": "I",
+    "keys": "I",
+    "roots": "I",
+    "ints": "q",
+    "floats": "d",
+    "strings": "B",
+    "string_offsets": "I",
+}
+
+
+class Columnar(Sequence):
+    """Flat columnar encoding of a sequence of generated objects, much more compact
+    than the equivalent tree of Python objects.
+
+    Nodes are stored in depth-first order, every node has an entry in each of the
+    following columns:
+
+    - `kinds` (`array('B')`): the `NodeKind` of the node.
+    - `sizes` (`array('I')`): the number of nodes of the subtree of the node, the next
+      sibling of a node is at `node + sizes[node]`.
+    - `offsets` (`array('I')`): for leaves, the index of the value in the buffer of
+      their kind, for dicts, the index in `keys` of the key of their first child, for
+      lists and tuples, the number of children.
+
+    The `keys` column (`array('I')`) only holds the keys of the children of dicts, as
+    indices in the string buffer, the keys of a dict are contiguous. Leaf values are
+    stored in typed buffers: `ints` (`array('q')`), `floats` (`array('d')`), `strings`
+    (utf-8 bytes, delimited by `string_offsets`) and `objects`, a list of all other
+    leaves (e.g. large ints, booleans, custom objects).
+
+    As a sequence, a `Columnar` lazily decodes its root objects on access.
+    """
+
+    def __init__(self) -> None:
+        """Constructor for `Columnar`, creates an empty encoding."""
+        self.kinds = array("B")
+        self.sizes = array("I")
+        self.offsets = array("I")
+        self.keys = array("I")
+        self.roots = array("I")
+        self.ints = array("q")
+        self.floats = array("d")
+        self.strings = bytearray()
+        self.string_offsets = array("I", [0])
+        self.objects: list[Any] = []
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, Any], objects: list[Any]) -> Columnar:
+        """Creates an encoding from existing columns, e.g. memoryviews of a memory
+        mapped file. Encodings created from read-only buffers cannot be extended.
+
+        Args:
+            columns (dict[str, Any]): The columns and buffers, by name, see `COLUMNS`.
+            objects (list[Any]): The leaves that are not stored in typed buffers.
+
+        Returns:
+            Columnar: The encoding.
+        """
+        res = cls()
+        for name in COLUMNS:
+            setattr(res, name, columns[name])
+        res.objects = objects
+        return res
+
+    def columns(self) -> dict[str, Any]:
+        """Returns the columns and buffers of this encoding, by name.
+
+        Returns:
+            dict[str, Any]: The columns and buffers, see `COLUMNS`.
+        """
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    def _add_string(self, value: str) -> int:
+        self.strings += value.encode("utf-8", "surrogatepass")
+        self.string_offsets.append(len(self.strings))
+        return len(self.string_offsets) - 2
+
+    def _add_leaf(self, value: Any) -> tuple[NodeKind, int]:
+        vtype = type(value)
+        if vtype is int and _INT_MIN <= value <= _INT_MAX:
+            self.ints.append(value)
+            return NodeKind.INT, len(self.ints) - 1
+        if vtype is float:
+            self.floats.append(value)
+            return NodeKind.FLOAT, len(self.floats) - 1
+        if vtype is str:
+            return NodeKind.STR, self._add_string(value)
+        self.objects.append(value)
+        return NodeKind.OBJECT, len(self.objects) - 1
+
+    def extend(self, events: Iterable[Event]) -> None:
+        """Appends the objects described by a stream of events.
+
+        Args:
+            events (Iterable[Event]): The events, e.g. from `Rsg.events`.
+        """
+        kinds, sizes, offsets, keys = self.kinds, self.sizes, self.offsets, self.keys
+        # Open containers, with the keys of their children for dicts. The keys of a
+        # dict are written when it ends, so that they are contiguous.
+        stack: list[tuple[int, Optional[list[int]]]] = []
+
+        for event in events:
+            etype = event.type
+            if etype is EventType.KEY:
+                stack[-1][1].append(self._add_string(str(event.value)))
+                continue
+            if etype in _END_EVENTS:
+                node, node_keys = stack.pop()
+                sizes[node] = len(kinds) - node
+                if node_keys is not None:
+                    offsets[node] = len(keys)
+                    keys.extend(node_keys)
+                continue
+
+            node = len(kinds)
+            if stack:
+                parent = stack[-1]
+                if parent[1] is None:
+                    offsets[parent[0]] += 1
+            else:
+                self.roots.append(node)
+
+            kind = _START_KINDS.get(etype)
+            if kind is None:
+                kind, offset = self._add_leaf(event.value)
+            else:
+                offset = 0
+                stack.append((node, [] if kind == NodeKind.DICT else None))
+
+            kinds.append(kind)
+            sizes.append(1)
+            offsets.append(offset)
+
+    def string(self, index: int) -> str:
+        """Decodes a string of the string buffer.
+
+        Args:
+            index (int): The index of the string.
+
+        Returns:
+            str: The string.
+        """
+        start, end = self.string_offsets[index], self.string_offsets[index + 1]
+        return str(self.strings[start:end], "utf-8", "surrogatepass")
+
+    def children(self, node: int) -> Iterator[int]:
+        """Iterates over the children of a node.
+
+        Args:
+            node (int): The index of the node.
+
+        Yields:
+            Iterator[int]: The indices of the children.
+        """
+        sizes = self.sizes
+        child, end = node + 1, node + sizes[node]
+        while child < end:
+            yield child
+            child += sizes[child]
+
+    def decode(self, node: int) -> Any:
+        """Decodes a node and its subtree into Python objects.
+
+        Args:
+            node (int): The index of the node.
+
+        Returns:
+            Any: The decoded object.
+        """
+        kind, offset = self.kinds[node], self.offsets[node]
+        if kind == NodeKind.INT:
+            return self.ints[offset]
+        if kind == NodeKind.FLOAT:
+            return self.floats[offset]
+        if kind == NodeKind.STR:
+            return self.string(offset)
+        if kind == NodeKind.OBJECT:
+            return self.objects[offset]
+        sizes = self.sizes
+        child, end = node + 1, node + sizes[node]
+        if kind == NodeKind.DICT:
+            keys, res = self.keys, {}
+            while child < end:
+                res[self.string(keys[offset])] = self.decode(child)
+                child += sizes[child]
+                offset += 1
+            return res
+        values = []
+        while child < end:
+            values.append(self.decode(child))
+            child += sizes[child]
+        return values if kind == NodeKind.LIST else tuple(values)
+
+    @property
+    def nbytes(self) -> int:
+        """The memory of the columns and buffers, in bytes, excluding `objects`."""
+        return sum(len(x) * memoryview(x).itemsize for x in self.columns().values())
+
+    def __len__(self) -> int:
+        return len(self.roots)
+
+    def __getitem__(self, index: int) -> Any:
+        if isinstance(index, slice):
+            return [self.decode(x) for x in self.roots[index]]
+        return self.decode(self.roots[index])
+
+
+def to_columnar(rsg: Rsg, n: int) -> Columnar:
+    """Generate `n` random objects directly in columnar form, streaming the events
+    of every object without building the tree of Python objects.
+
+    Args:
+        rsg (Rsg): The generator.
+        n (int): The number of objects to generate.
+
+    Returns:
+        Columnar: The columnar encoding of the objects.
+    """
+    res = Columnar()
+    for _ in range(n):
+        res.extend(iter_events(rsg))
+    return res
@@ -1,12 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
 import string
+import threading
 from abc import ABCMeta
-from random import choice, choices, randint, random
-from typing import Any, Callable, Iterable
-
-from rsg.utils.helpers import inspect_signature, make_attrs
+from collections import OrderedDict
+from itertools import accumulate
+from random import Random, getrandbits
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+)
+
+from rsg.hooks import GenerationHook
+from rsg.lazy import LazyChildren, LazyList, LazyTuple
+from rsg.utils.blocks import make_leaf_backend
+from rsg.utils.budget import Budget
+from rsg.utils.aio import AsyncLimiter
+from rsg.utils.alias import AliasTable
+from rsg.utils.helpers import derive_seed, inspect_signature, make_attrs
+from rsg.utils.pool import PoolPolicy, ValuePool
+from rsg.utils.strings import Charset, StringEngine
+
+if TYPE_CHECKING:  # pragma: no cover
+    from rsg.columnar import Columnar
+    from rsg.events import Event
 
 _gen_meth_t = Callable[[], Any]
 
@@ -27,6 +52,8 @@ class _GeneratorFn:
         argnames: list[str],
         kwargnames: dict[str, Any],
         default_chance: float,
+        container: Optional[str] = None,
+        is_async: bool = False,
     ) -> None:
         """Constructor for `_GeneratorFN`.
 
@@ -38,6 +65,11 @@ class _GeneratorFn:
             argnames (list[str]): The names of all positional arguments.
             kwargnames (dict[str, Any]): The names and default value of all keyword
             arguments.
+            default_chance (float): The default chance associated to this method.
+            container (Optional[str], optional): The built-in container type produced
+            by this method, see `generator`. Defaults to None.
+            is_async (bool, optional): True if the method is a coroutine function.
+            Defaults to False.
         """
         make_attrs(self, locals(), private=True)
 
@@ -62,7 +94,123 @@ class _GeneratorFn:
         """The default chance associated to this method"""
         return self._default_chance
 
+    @property
+    def is_async(self) -> bool:
+        """True if the wrapped method is a coroutine function."""
+        return self._is_async
+
+    @property
+    def container(self) -> Optional[str]:
+        """The built-in container type produced by this method, if any."""
+        return self._container
+
+    @property
+    def method(self) -> _gen_meth_t:
+        """The wrapped method."""
+        return self._method
+
+    def resolve(self, caller: Rsg) -> tuple[tuple, dict[str, Any]]:
+        """Resolves the values of the arguments of the wrapped method from the
+        attributes of `caller`.
+
+        Args:
+            caller (Rsg): The `Rsg` instance providing the argument values.
+
+        Raises:
+            AttributeError: If a required argument is not set in `caller`.
+
+        Returns:
+            tuple[tuple, dict[str, Any]]: The positional and keyword arguments.
+        """
+        missing = [x for x in self._argnames if not hasattr(caller, x)]
+        if len(missing) > 0:
+            raise AttributeError(
+                f"{caller.__class__.__name__} is missing the required parameter(s) "
+                f"{', '.join(missing)} of generator '{self.name}'"
+            )
+        args = tuple(getattr(caller, x) for x in self._argnames)
+        kwargs = {k: getattr(caller, k, v) for k, v in self._kwargnames.items()}
+        return args, kwargs
+
+    def compile(self, caller: Rsg) -> Callable[[Rsg], Any]:
+        """Resolves all the arguments of the wrapped method from the attributes of
+        `caller` once, returning a callable that only needs the `Rsg` instance to
+        generate a new object.
+
+        Args:
+            caller (Rsg): The `Rsg` instance providing the argument values.
+
+        Raises:
+            AttributeError: If a required argument is not set in `caller`.
+
+        Returns:
+            Callable[[Rsg], Any]: The compiled generator method.
+        """
+        method = self._method
+        args, kwargs = self.resolve(caller)
+
+        if self.is_async:
+
+            def _call(caller: Rsg) -> Any:
+                raise TypeError(
+                    f"Generator '{self.name}' is async, use `agenerate` instead"
+                )
+
+        elif self.is_leaf:
+
+            def _call(caller: Rsg) -> Any:
+                return method(caller, *args, **kwargs)
+
+        else:
+
+            def _call(caller: Rsg) -> Any:
+                # `children` is CHILDREN_ARG, spelled out to avoid building a dict
+                return method(
+                    caller, *args, children=caller._generate_children(), **kwargs
+                )
+
+        return _call
+
+    def acompile(self, caller: Rsg) -> Callable[[Rsg], Awaitable[Any]]:
+        """Like `compile`, but returns a coroutine function that generates children
+        with `Rsg._agenerate_children` and awaits the wrapped method if it is async,
+        within the concurrency limit of the caller.
+
+        Args:
+            caller (Rsg): The `Rsg` instance providing the argument values.
+
+        Raises:
+            AttributeError: If a required argument is not set in `caller`.
+
+        Returns:
+            Callable[[Rsg], Awaitable[Any]]: The compiled generator method.
+        """
+        method = self._method
+        args, kwargs = self.resolve(caller)
+        is_leaf, is_async = self.is_leaf, self.is_async
+
+        async def _call(caller: Rsg) -> Any:
+            if is_leaf:
+                res = method(caller, *args, **kwargs)
+            else:
+                children = await caller._agenerate_children()
+                res = method(caller, *args, children=children, **kwargs)
+            if is_async:
+                limiter = caller._limiter
+                if limiter is None:
+                    res = await res
+                else:
+                    async with limiter.semaphore():
+                        res = await res
+            return res
+
+        return _call
+
     def __call__(self, caller: Rsg) -> Any:
+        if self.is_async:
+            raise TypeError(
+                f"Generator '{self.name}' is async, use `agenerate` instead"
+            )
         args = [getattr(caller, x) for x in self._argnames]
         kwargs = {k: getattr(caller, k, v) for k, v in self._kwargnames.items()}
 
@@ -83,7 +231,11 @@ class _GeneratorFnFactory:
 
     @classmethod
     def create(
-        cls, name: str, fn: Callable, default_chance: float = 1.0
+        cls,
+        name: str,
+        fn: Callable,
+        default_chance: float = 1.0,
+        container: Optional[str] = None,
     ) -> _GeneratorFn:
         """Creates a `_GeneratorFn` from a name and a callable method.
 
@@ -92,6 +244,8 @@ class _GeneratorFnFactory:
             fn (Callable): Method to decorate.
             default_chance (float, optional): Default chance for this generator,
             defaults to 1.0
+            container (Optional[str], optional): The built-in container type produced
+            by the method, defaults to None
 
         Returns:
             _GeneratorFn: The decorated method as a `_GeneratorFn` instance.
@@ -101,11 +255,16 @@ class _GeneratorFnFactory:
         is_leaf = _GeneratorFn.CHILDREN_ARG not in args
         if not is_leaf:
             args.remove(_GeneratorFn.CHILDREN_ARG)
-        return _GeneratorFn(name, is_leaf, fn, args, kwargs, default_chance)
+        if container is not None and is_leaf:
+            raise ValueError(f"Leaf generator '{name}' cannot produce a container")
+        is_async = inspect.iscoroutinefunction(fn)
+        return _GeneratorFn(
+            name, is_leaf, fn, args, kwargs, default_chance, container, is_async
+        )
 
 
 def generator(
-    name: str, default_chance: float = 1.0
+    name: str, default_chance: float = 1.0, container: Optional[str] = None
 ) -> Callable[[Callable], _GeneratorFn]:
     """Decorator for generator methods. Any method decorated with this function is
     added to a pool of generators and automatically invoked with the right arguments.
@@ -116,26 +275,216 @@ def generator(
         name (str): The custom name of the method
         default_chance (float, optional): Default chance for this generator, defaults to
         1.0
+        container (Optional[str], optional): Declares that a composite method returns
+        a built-in container of its children, one of "list", "tuple" or "dict". This
+        lets `Rsg.events` stream the container instead of materializing it. Dict
+        containers require the `Rsg` to implement a `_generate_key` method accepting
+        the keyword arguments of the generator method. Defaults to None.
 
     Returns:
         Callable[[Callable], _GeneratorFn]: Decorator function.
     """
 
     def _wrapped(fn: Callable) -> _GeneratorFn:
-        return _GeneratorFnFactory.create(name, fn, default_chance=default_chance)
+        return _GeneratorFnFactory.create(
+            name, fn, default_chance=default_chance, container=container
+        )
 
     return _wrapped
 
 
+_DEFAULT_GENERATOR = _GeneratorFnFactory.create("default", (lambda self: None))
+
+
 class RsgMeta(ABCMeta):
-    """Metaclass that inspects members to find all `_GeneratorFn` instances and adds
-    them to a class attribute.
+    """Metaclass that finds all `_GeneratorFn` members and adds them to a class
+    attribute.
+
+    The registry is built by merging the generators declared by every class along the
+    MRO, so class creation only scales with the number of generator methods, not with
+    the number of attributes in the hierarchy. The registry is frozen: the
+    `_generators_map` attribute is a read-only mapping and `_generators` a frozenset.
     """
 
     def __init__(self, name, bases, namespace) -> None:
         super().__init__(name, bases, namespace)
-        gen = inspect.getmembers(self, predicate=lambda x: isinstance(x, _GeneratorFn))
-        self._generators_map: dict[str, _GeneratorFn] = {v.name: v for _, v in gen}
+
+        merged: dict[str, _GeneratorFn] = {}
+        for base in reversed(self.__mro__[1:]):
+            merged.update(base.__dict__.get("_own_generators", {}))
+        own = {k: v for k, v in namespace.items() if isinstance(v, _GeneratorFn)}
+        merged.update(own)
+
+        # Every name is resolved against the MRO, so that inherited generators are
+        # dropped when they are shadowed by a regular attribute of any class.
+        generators = {
+            v.name: v for k, v in merged.items() if getattr(self, k, None) is v
+        }
+        self._own_generators = MappingProxyType(own)
+        self._generators_map = MappingProxyType(generators)
+        self._generators = frozenset(generators.values())
+
+
+class _Level:
+    """Generation state of a depth level of an `Rsg`: the available generator methods,
+    their compiled callables and the alias tables to sample them. Levels are immutable
+    and shared by all the `Rsg` instances with the same configuration, see
+    `_level_table`.
+    """
+
+    __slots__ = (
+        "min_depth",
+        "max_depth",
+        "fns",
+        "cum_weights",
+        "fn_table",
+        "compiled",
+        "call_table",
+        "acall_table",
+        "leaf_fn_table",
+        "leaf_table",
+        "resolved",
+    )
+
+    def __init__(self, proto: Rsg) -> None:
+        """Constructor for `_Level`.
+
+        Args:
+            proto (Rsg): An `Rsg` configured as the level, providing the values of the
+            arguments of the generator methods.
+        """
+        kwargs = proto._kwargs
+        self.min_depth = proto.min_depth
+        self.max_depth = proto.max_depth
+
+        generators = proto._generators or frozenset([_DEFAULT_GENERATOR])
+        leaf_gen = {x for x in generators if x.is_leaf}
+        non_leaf_gen = {x for x in generators if not x.is_leaf}
+
+        available_gen = set()
+        if self.min_depth == 0:
+            available_gen.update(leaf_gen)
+        if self.max_depth > 0:
+            available_gen.update(non_leaf_gen)
+
+        if len(available_gen) == 0:
+            available_gen = generators
+
+        def _table(fns: set[_GeneratorFn]) -> tuple[tuple, list[float]]:
+            fns = tuple(sorted(fns, key=lambda x: x.name))
+            return fns, [kwargs.get(x.chance_kw, x.default_chance) for x in fns]
+
+        # Freeze the method table once per level, methods are sampled in constant time
+        # from its alias table.
+        self.fns, chances = _table(available_gen)
+        self.cum_weights = tuple(accumulate(chances))
+        self.fn_table = AliasTable(self.fns, chances)
+
+        # Resolve the arguments of every generator method, so that missing parameters
+        # are reported at construction rather than during generation.
+        compiled = {x: x.compile(proto) for x in generators}
+        # The method and resolved arguments of every generator, for engines that
+        # generate children themselves, see `rsg.iterative`.
+        self.resolved = {x: (x.method, *x.resolve(proto)) for x in generators}
+        if proto.leaf_pool is not None:
+            compiled = {
+                k: _pooled(k.name, v) if k.is_leaf else v for k, v in compiled.items()
+            }
+        if proto.hook is not None:
+            compiled = {k: proto.hook.wrap(k.name, v) for k, v in compiled.items()}
+        self.compiled = compiled
+        self.call_table = self.fn_table.with_items([compiled[x] for x in self.fns])
+        self.acall_table = self.fn_table.with_items(
+            [x.acompile(proto) for x in self.fns]
+        )
+
+        # Tables of the leaf generators, used when the budget runs out.
+        self.leaf_fn_table = self.leaf_table = None
+        if proto._budget is not None:
+            leaf_fns, leaf_chances = _table(leaf_gen)
+            if sum(leaf_chances) > 0:
+                self.leaf_fn_table = AliasTable(leaf_fns, leaf_chances)
+                self.leaf_table = self.leaf_fn_table.with_items(
+                    [compiled[x] for x in leaf_fns]
+                )
+
+
+def _pooled(name: str, call: Callable[[Rsg], Any]) -> Callable[[Rsg], Any]:
+    # Draws the values of a compiled leaf generator method from the pool of its caller.
+    def _call(caller: Rsg) -> Any:
+        return caller._pool(name).draw(call, caller)
+
+    return _call
+
+
+# Types of the leaves that can be shared by structural sharing.
+_FROZEN_TYPES = frozenset([type(None), bool, int, float, complex, str, bytes])
+
+_LEVEL_CACHE: OrderedDict[tuple, tuple[_Level, ...]] = OrderedDict()
+_LEVEL_CACHE_SIZE = 256
+_LEVEL_CACHE_LOCK = threading.Lock()
+
+
+def _level_table(rsg: Rsg) -> tuple[_Level, ...]:
+    """Returns the levels of an `Rsg`, one per depth from 0 to `max_depth`. Level
+    tables are built once and shared by all `Rsg` instances with equal class and
+    configuration (a bounded number of them are cached), unless the configuration
+    contains unhashable values.
+
+    Args:
+        rsg (Rsg): The `Rsg`.
+
+    Returns:
+        tuple[_Level, ...]: The level table.
+    """
+    try:
+        # Arguments are resolved from the attributes of the `Rsg`, which subclasses
+        # may set outside of the keyword arguments.
+        resolved = []
+        for fn in sorted(rsg._generators, key=lambda x: x.name):
+            args, kwargs = fn.resolve(rsg)
+            resolved.append((fn.name, args, tuple(sorted(kwargs.items()))))
+        key = (
+            rsg.__class__,
+            rsg.min_depth,
+            rsg.max_depth,
+            rsg.min_breadth,
+            rsg.max_breadth,
+            rsg._budget is not None,
+            rsg.leaf_pool is not None,
+            rsg.hook,
+            tuple(sorted(rsg._kwargs.items(), key=lambda x: x[0])),
+            tuple(resolved),
+        )
+        hash(key)
+    except (AttributeError, TypeError):
+        # Missing arguments are reported by the levels, unhashable ones not cached.
+        return _build_level_table(rsg)
+
+    with _LEVEL_CACHE_LOCK:
+        levels = _LEVEL_CACHE.get(key)
+        if levels is not None:
+            _LEVEL_CACHE.move_to_end(key)
+            return levels
+
+    # Built outside the lock: two threads may build the same table, only one is kept.
+    levels = _build_level_table(rsg)
+    with _LEVEL_CACHE_LOCK:
+        levels = _LEVEL_CACHE.setdefault(key, levels)
+        if len(_LEVEL_CACHE) > _LEVEL_CACHE_SIZE:
+            _LEVEL_CACHE.popitem(last=False)
+    return levels
+
+
+def _build_level_table(rsg: Rsg) -> tuple[_Level, ...]:
+    levels = []
+    for depth in range(max(rsg.max_depth, 0) + 1):
+        proto = object.__new__(rsg.__class__)
+        proto.__dict__.update(rsg.__dict__)
+        proto.min_depth = max(0, rsg.min_depth - depth)
+        proto.max_depth = max(0, rsg.max_depth - depth)
+        levels.append(_Level(proto))
+    return tuple(levels)
 
 
 class Rsg(metaclass=RsgMeta):
@@ -214,17 +563,23 @@ class Rsg(metaclass=RsgMeta):
 
     """
 
-    @classmethod
-    @property
-    def _generators(cls) -> set[_GeneratorFn]:
-        return set(cls._generators_map.values())
-
     def __init__(
         self,
         min_depth: int = 0,
         max_depth: int = 1,
         min_breadth: int = 0,
         max_breadth: int = 1,
+        backend: Any = "random",
+        seed: Optional[int] = None,
+        rng: Optional[Random] = None,
+        lazy_children: bool = False,
+        max_nodes: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        hook: Optional[GenerationHook] = None,
+        max_concurrency: Optional[int] = None,
+        leaf_pool: Optional[PoolPolicy] = None,
+        share_chance: float = 0.0,
+        share_cache_size: int = 64,
         **kwargs,
     ) -> None:
         """Constructor for `Rsg`
@@ -236,47 +591,301 @@ class Rsg(metaclass=RsgMeta):
             min_breadth (int, optional): Minimum number of children. Ignored if maximum
             depth is 0. Defaults to 0.
             max_breadth (int, optional): Maximum number of children. Defaults to 1.
+            backend (Any, optional): Backend of the built-in leaf generators, either
+            "random" (stdlib `random` module) or "numpy" (vectorized blocks drawn with
+            numpy, which must be installed). Defaults to "random".
+            seed (Optional[int], optional): Seed of the random number generator of
+            this `Rsg`. If both `seed` and `rng` are None, a seed is drawn from the
+            global `random` module. Defaults to None.
+            rng (Optional[Random], optional): A custom random number generator, with
+            the same interface as `random.Random`. Defaults to None.
+            lazy_children (bool, optional): True to pass composite generator methods
+            a `LazyChildren` iterator that generates each child only when requested,
+            instead of a list. Built-in lists and tuples become `LazyList` and
+            `LazyTuple` proxies. Note that the generated values depend on the order in
+            which children are materialized. Defaults to False.
+            max_nodes (Optional[int], optional): Maximum number of nodes of every
+            generated structure. When the budget runs out, leaf generators are
+            preferred and the remaining children are truncated. Defaults to None.
+            max_bytes (Optional[int], optional): Approximate maximum memory of every
+            generated structure, in bytes, enforced like `max_nodes`. Defaults to None.
+            hook (Optional[GenerationHook], optional): Hook called when entering and
+            exiting every generator method, e.g. a `rsg.profiling.Profiler`. Defaults
+            to None.
+            max_concurrency (Optional[int], optional): Maximum number of async generator
+            methods awaited concurrently by `agenerate`, None for no limit. Defaults to
+            None.
+            leaf_pool (Optional[PoolPolicy], optional): If set, every leaf generator
+            method (and the keys of built-in dictionaries) fills a bounded pool of
+            values and samples references from it, so that leaves share storage.
+            Defaults to None.
+            share_chance (float, optional): Probability that a child is a reference to
+            a previously generated subtree at the same depth, instead of a new one.
+            Only deeply immutable subtrees (e.g. tuples of numbers and strings) are
+            shared. The output is then a DAG, whose generation time and memory scale
+            with the number of unique subtrees. Defaults to 0.0.
+            share_cache_size (int, optional): Maximum number of subtrees cached for
+            reuse at every depth. Defaults to 64.
+
+        Raises:
+            ValueError: If incompatible options are combined, e.g. a budget or a hook
+            with lazy children, or `max_bytes`, `leaf_pool`, `share_chance`, `hook` or
+            `lazy_children` with async generator methods.
         """
+        if lazy_children and (max_nodes is not None or max_bytes is not None):
+            raise ValueError("Budgets are not supported with lazy children")
+        if lazy_children and hook is not None:
+            # Lazy children are generated after the exit call of their parent.
+            raise ValueError("Hooks are not supported with lazy children")
+        if share_chance > 0 and (
+            lazy_children or max_nodes is not None or max_bytes is not None
+        ):
+            raise ValueError(
+                "Structural sharing is not supported with lazy children or budgets"
+            )
+        if share_cache_size < 1:
+            raise ValueError(
+                f"share_cache_size must be at least 1, got {share_cache_size}"
+            )
+        if seed is None and rng is None:
+            seed = getrandbits(64)
+        if rng is None:
+            rng = Random(seed)
         make_attrs(self, locals())
         self._kwargs = kwargs
         self._child = None
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._index = 0
+        self._leaf_backend = make_leaf_backend(backend, rng=rng)
+        self._strings = StringEngine(rng)
+        self._limiter = None
+        if max_concurrency is not None:
+            self._limiter = AsyncLimiter(max_concurrency)
+        self._is_async = any(x.is_async for x in self._generators)
+        if self._is_async and (
+            max_bytes is not None
+            or leaf_pool is not None
+            or share_chance > 0
+            or hook is not None
+            or lazy_children
+        ):
+            raise ValueError(
+                "Memory budgets, leaf pools, structural sharing, hooks and lazy "
+                "children are not supported with async generator methods"
+            )
+        self._pools = None if leaf_pool is None else {}
+        self._shared = [] if share_chance > 0 else None
+        # id -> object of the subtree cache, to check immutability in constant time.
+        self._shared_ids: dict[int, Any] = {}
+        self._budget = None
+        if max_nodes is not None or max_bytes is not None:
+            self._budget = Budget(max_nodes=max_nodes, max_bytes=max_bytes)
+        # The creating thread generates with this instance, other threads with their
+        # own copy, see `_thread_rsg`.
+        self._owner = threading.get_ident()
+        self._threads = threading.local()
+        self._thread_count = 0
+
+        self._levels = _level_table(self)
+        self._set_level(0)
+
+    def _set_level(self, index: int) -> None:
+        # Binds this instance to a level of the (shared) level table.
+        level = self._levels[index]
+        self._level_index = index
+        self.min_depth = level.min_depth
+        self.max_depth = level.max_depth
+        self._gen_fns = level.fns
+        self._gen_cum_weights = level.cum_weights
+        self._gen_fn_table = level.fn_table
+        self._gen_compiled = level.compiled
+        self._gen_call_table = level.call_table
+        self._gen_acall_table = level.acall_table
+        self._leaf_fn_table = level.leaf_fn_table
+        self._leaf_table = level.leaf_table
 
-        if len(self._generators) == 0:
-            gen = _GeneratorFnFactory.create("default", (lambda self: None))
-            self._generators_map[gen.name] = gen
+    @property
+    def child(self) -> Rsg:
+        """Returns a copy of this `Rsg` with min and max depth reduced by one. The copy
+        shares the configuration, the level table and the random number generator
+        with this `Rsg`, so it is cheap to create.
 
-        leaf_gen = {x for x in self._generators if x.is_leaf}
-        non_leaf_gen = {x for x in self._generators if not x.is_leaf}
+        Returns:
+            Rsg: The child `Rsg`
+        """
+        child = self._child
+        if child is None:
+            with self._lock:
+                child = self._child
+                if child is None:
+                    child = object.__new__(self.__class__)
+                    child.__dict__.update(self.__dict__)
+                    child._child = None
+                    child._depth = self._depth + 1
+                    child._shared = None if self._shared is None else []
+                    child._shared_ids = {}
+                    child._threads = threading.local()
+                    child._thread_count = 0
+                    child._set_level(min(self._level_index + 1, len(self._levels) - 1))
+                    self._child = child
+        return child
 
-        available_gen = set()
-        if self.min_depth == 0:
-            available_gen.update(leaf_gen)
-        if self.max_depth > 0:
-            available_gen.update(non_leaf_gen)
+    @property
+    def config(self) -> dict[str, Any]:
+        """The constructor arguments of this `Rsg`, excluding its random number
+        generator.
 
-        if len(available_gen) == 0:
-            available_gen = self._generators
+        Returns:
+            dict[str, Any]: The constructor arguments.
+        """
+        return dict(
+            min_depth=self.min_depth,
+            max_depth=self.max_depth,
+            min_breadth=self.min_breadth,
+            max_breadth=self.max_breadth,
+            backend="random" if self._leaf_backend is None else "numpy",
+            lazy_children=self.lazy_children,
+            max_nodes=self.max_nodes,
+            max_bytes=self.max_bytes,
+            hook=self.hook,
+            max_concurrency=self.max_concurrency,
+            leaf_pool=self.leaf_pool,
+            share_chance=self.share_chance,
+            share_cache_size=self.share_cache_size,
+            **self._kwargs,
+        )
+
+    @property
+    def root_seed(self) -> int:
+        """The seed from which all substreams are derived. If this `Rsg` was created
+        with a custom `rng` and no seed, the seed is drawn from `rng`.
+
+        Returns:
+            int: The root seed.
+        """
+        if self.seed is None:
+            self.seed = self.rng.getrandbits(64)
+        return self.seed
+
+    def substream(self, index: int) -> Rsg:
+        """Returns a copy of this `Rsg` with an independent random number generator,
+        seeded deterministically from the seed of this `Rsg` and `index`. Substreams
+        with the same index always generate the same objects, without the need to
+        generate the preceding ones.
 
-        self._gen_chances = {
-            x: kwargs.get(x.chance_kw, x.default_chance) for x in available_gen
+        Args:
+            index (int): The index of the substream.
+
+        Returns:
+            Rsg: The substream `Rsg`
+        """
+        return self.__class__(seed=derive_seed(self.root_seed, index), **self.config)
+
+    def split(self, n: int) -> list[Rsg]:
+        """Splits this `Rsg` into `n` independent and reproducible substreams.
+
+        Args:
+            n (int): The number of substreams.
+
+        Returns:
+            list[Rsg]: The substream `Rsg`s, see `substream`.
+        """
+        return [self.substream(i) for i in range(n)]
+
+    def _pool(self, name: str) -> ValuePool:
+        """Returns the leaf value pool with a given name, shared by all the levels of
+        this `Rsg` and created on first use. Pooling must be enabled with `leaf_pool`.
+
+        Args:
+            name (str): The name of the pool.
+
+        Returns:
+            ValuePool: The value pool.
+        """
+        pool = self._pools.get(name)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.setdefault(name, ValuePool(self.rng, self.leaf_pool))
+        return pool
+
+    def getstate(self) -> dict[str, Any]:
+        """Returns a snapshot of the generation state of this `Rsg`: its class and
+        configuration, the number of objects generated by `generate_stream`, the state
+        of the random number generator, of the leaf backend, of the string buffers,
+        of the leaf pools and of the subtree caches. The snapshot can be pickled, as
+        long as the configuration (e.g. the hook) and the pooled values can.
+
+        Returns:
+            dict[str, Any]: The state, see `resume`.
+        """
+        shared, node = [], self
+        while node is not None and node._shared is not None:
+            shared.append(list(node._shared))
+            node = node._child
+
+        backend, pools = self._leaf_backend, self._pools
+        if pools is not None:
+            pools = {k: v.getstate() for k, v in pools.items()}
+        return {
+            "class": f"{self.__class__.__module__}.{self.__class__.__qualname__}",
+            "config": self.config,
+            "seed": self.seed,
+            "index": self._index,
+            "rng": self.rng.getstate(),
+            "backend": None if backend is None else backend.getstate(),
+            "strings": self._strings.getstate(),
+            "pools": pools,
+            "shared": shared,
         }
 
-    @property
-    def child(self) -> Rsg:
-        """Returns a copy of this `Rsg` with min and max depth reduced by one.
+    @classmethod
+    def resume(cls, state: dict[str, Any]) -> Rsg:
+        """Creates an `Rsg` from a state snapshot, which generates exactly the same
+        objects that the snapshotted `Rsg` would have generated. The random number
+        generator of the new `Rsg` is a `random.Random`.
+
+        Args:
+            state (dict[str, Any]): A state returned by `getstate`.
+
+        Raises:
+            ValueError: If the state was taken from an `Rsg` of a different class.
 
         Returns:
-            Rsg: The child `Rsg`
+            Rsg: The resumed `Rsg`.
         """
-        if self._child is None:
-            self._child = self.__class__(
-                min_depth=max(0, self.min_depth - 1),
-                max_depth=max(0, self.max_depth - 1),
-                min_breadth=self.min_breadth,
-                max_breadth=self.max_breadth,
-                **self._kwargs,
-            )
-        return self._child
+        name = f"{cls.__module__}.{cls.__qualname__}"
+        if state["class"] != name:
+            raise ValueError(f"Cannot resume a {state['class']} state as {name}")
+
+        rsg = cls(seed=state["seed"], rng=Random(), **state["config"])
+        rsg._index = state["index"]
+        rsg.rng.setstate(state["rng"])
+        if state["backend"] is not None:
+            rsg._leaf_backend.setstate(state["backend"])
+        rsg._strings.setstate(state["strings"])
+        for k, v in (state["pools"] or {}).items():
+            rsg._pool(k).setstate(v)
+        node = rsg
+        for cache in state["shared"]:
+            node._shared[:] = cache
+            node._shared_ids = {id(x): x for x in cache}
+            node = node.child
+        return rsg
+
+    def _children_count(self) -> int:
+        """Draws the random number of children of a composite object.
+
+        Returns:
+            int: The number of children
+        """
+        n = self.rng.randint(self.min_breadth, self.max_breadth)
+        n = n if self.max_depth > 0 else 0
+        if self._budget is not None:
+            n = self._budget.take(n)
+        if self.hook is not None:
+            self.hook.on_children(self._depth, n)
+        return n
 
     def _generate_children(self) -> Iterable[Any]:
         """Generate a random amount of children objects using the child rsg.
@@ -284,20 +893,290 @@ class Rsg(metaclass=RsgMeta):
         Returns:
             Iterable[Any]: An iterable of children objects
         """
-        n = randint(self.min_breadth, self.max_breadth)
-        n = n if self.max_depth > 0 else 0
-        res = [next(self.child) for _ in range(n)]
+        if self.lazy_children:
+            return LazyChildren(self.child, self._children_count())
+        if self._shared is not None:
+            return self.child._generate_shared(self._children_count())
+        return self.child._generate_many(self._children_count())
+
+    def _generate_shared(self, n: int) -> list[Any]:
+        """Generate `n` random objects, each of which is either a new object or, with
+        probability `share_chance`, a previously generated object from the bounded
+        subtree cache of this depth. Only deeply immutable objects are cached.
+
+        Args:
+            n (int): The number of objects to generate.
+
+        Returns:
+            list[Any]: The generated objects
+        """
+        cache, frozen, rng = self._shared, self._shared_ids, self.rng
+        chance, size = self.share_chance, self.share_cache_size
+        res = []
+        for _ in range(n):
+            if cache and rng.random() < chance:
+                res.append(cache[rng.randrange(len(cache))])
+                continue
+            x = self._generate()
+            res.append(x)
+            if not self._is_frozen(x):
+                continue
+            if len(cache) < size:
+                cache.append(x)
+            else:
+                i = rng.randrange(size)
+                frozen.pop(id(cache[i]), None)
+                cache[i] = x
+            frozen[id(x)] = x
         return res
 
+    def _is_frozen(self, obj: Any) -> bool:
+        """Checks if an object generated at the depth of this `Rsg` is deeply
+        immutable, so that it can be shared. Objects of the subtree cache of the child
+        depth are immutable, so they are not traversed again.
+
+        Args:
+            obj (Any): The generated object.
+
+        Returns:
+            bool: True if the object is deeply immutable.
+        """
+        otype = type(obj)
+        if otype in _FROZEN_TYPES:
+            return True
+        if otype is not tuple and otype is not frozenset:
+            return False
+        child = self.child
+        frozen = child._shared_ids
+        return all(frozen.get(id(x)) is x or child._is_frozen(x) for x in obj)
+
+    def _thread_rsg(self) -> Rsg:
+        """Returns the `Rsg` generating for the current thread: this one in the thread
+        that created it, otherwise a copy owned by the current thread, with the same
+        configuration and its own random number generator (seeded from the root seed),
+        string buffers, budget, leaf pools and subtree caches.
+
+        Raises:
+            ValueError: If this `Rsg` has a hook, which would be shared by all the
+            threads.
+
+        Returns:
+            Rsg: The `Rsg` of the current thread.
+        """
+        if threading.get_ident() == self._owner:
+            return self
+        rsg = getattr(self._threads, "rsg", None)
+        if rsg is None:
+            if self.hook is not None:
+                raise ValueError(
+                    "An Rsg with a hook can only generate in the thread that created it"
+                )
+            with self._lock:
+                seed = derive_seed(self.root_seed, -1, self._thread_count)
+                self._thread_count += 1
+            rsg = self._threads.rsg = self.__class__(seed=seed, **self.config)
+        return rsg
+
     def generate(self) -> Any:
         """Generate a random object
 
         Returns:
             Any: The generated object
         """
-        fns, probs = list(zip(*[(k, v) for k, v in self._gen_chances.items()]))
-        fn = choices(fns, probs)[0]
-        return fn(self)
+        if threading.get_ident() != self._owner:
+            return self._thread_rsg()._generate()
+        return self._generate()
+
+    def _generate(self) -> Any:
+        if self._budget is not None:
+            return self._generate_budgeted(self._budget)
+        return self._gen_call_table.sample(self.rng)(self)
+
+    def _generate_budgeted(self, budget: Budget) -> Any:
+        # The outermost call starts a new structure, nested ones share its budget.
+        if not budget.active:
+            budget.reset()
+            budget.active = True
+            try:
+                return self._generate_budgeted(budget)
+            finally:
+                budget.active = False
+
+        table = self._gen_call_table
+        if budget.exhausted and self._leaf_table is not None:
+            table = self._leaf_table
+        res = table.sample(self.rng)(self)
+        budget.add(res)
+        return res
+
+    def generate_many(self, n: int) -> list[Any]:
+        """Generate `n` random objects at once. The generator methods of all the
+        objects are sampled in bulk from the precomputed weight table, which is much
+        cheaper than calling `generate` `n` times.
+
+        Args:
+            n (int): The number of objects to generate.
+
+        Returns:
+            list[Any]: The generated objects
+        """
+        if threading.get_ident() != self._owner:
+            return self._thread_rsg()._generate_many(n)
+        return self._generate_many(n)
+
+    def _generate_many(self, n: int) -> list[Any]:
+        if n <= 0:
+            return []
+        if self._budget is not None:
+            return [self._generate() for _ in range(n)]
+        return [fn(self) for fn in self._gen_call_table.sample_many(self.rng, n)]
+
+    async def agenerate(self) -> Any:
+        """Generate a random object asynchronously. Async generator methods are
+        awaited and sibling children are generated concurrently, so that I/O-bound
+        generator methods overlap. An `Rsg` with async generator methods cannot be
+        created with `max_bytes`, `leaf_pool`, `share_chance`, `hook` or
+        `lazy_children`.
+
+        Returns:
+            Any: The generated object
+        """
+        if threading.get_ident() != self._owner:
+            return await self._thread_rsg().agenerate()
+        if not self._is_async:
+            return self._generate()
+
+        budget = self._budget
+        if budget is not None and not budget.active:
+            budget.reset()
+            budget.active = True
+            try:
+                return await self.agenerate()
+            finally:
+                budget.active = False
+
+        return await self._gen_acall_table.sample(self.rng)(self)
+
+    async def _agenerate_children(self) -> list[Any]:
+        """Generate a random amount of children objects concurrently, using the
+        child rsg.
+
+        Returns:
+            list[Any]: The list of children objects
+        """
+        n = self._children_count()
+        if n <= 0:
+            return []
+        child = self.child
+        fns = child._gen_acall_table.sample_many(child.rng, n)
+        return list(await asyncio.gather(*(fn(child) for fn in fns)))
+
+    def __aiter__(self) -> Rsg:
+        return self
+
+    async def __anext__(self) -> Any:
+        """Alias for `agenerate`"""
+        return await self.agenerate()
+
+    def generate_threaded(
+        self, n: int, threads: Optional[int] = None, chunksize: int = 1000
+    ) -> list[Any]:
+        """Generate `n` random objects with a pool of threads, see
+        `rsg.parallel.generate_threaded`.
+        """
+        from rsg.parallel import generate_threaded
+
+        return generate_threaded(self, n, threads=threads, chunksize=chunksize)
+
+    def generate_parallel(
+        self,
+        n: int,
+        workers: Optional[int] = None,
+        chunksize: int = 1000,
+        ordered: bool = True,
+    ) -> Iterator[Any]:
+        """Generate `n` random objects with a pool of worker processes, see
+        `rsg.parallel.generate_parallel`.
+        """
+        from rsg.parallel import generate_parallel
+
+        return generate_parallel(
+            self, n, workers=workers, chunksize=chunksize, ordered=ordered
+        )
+
+    def events(self) -> Iterator[Event]:
+        """Generate a random object as a depth-first stream of events, see
+        `rsg.events.iter_events`.
+        """
+        from rsg.events import iter_events
+
+        return iter_events(self._thread_rsg())
+
+    def generate_iterative(self) -> Any:
+        """Generate a random object without recursion, see
+        `rsg.iterative.generate_iterative`.
+        """
+        from rsg.iterative import generate_iterative
+
+        return generate_iterative(self._thread_rsg())
+
+    def generate_columnar(self, n: int) -> Columnar:
+        """Generate `n` random objects in a compact columnar form, see
+        `rsg.columnar.to_columnar`.
+        """
+        from rsg.columnar import to_columnar
+
+        return to_columnar(self._thread_rsg(), n)
+
+    def generate_stream(
+        self,
+        n: Optional[int] = None,
+        checkpoint_every: int = 1000,
+        on_checkpoint: Optional[Callable[[dict[str, Any]], None]] = None,
+    ) -> Iterator[Any]:
+        """Generate random objects one at a time, until this `Rsg` has generated `n`
+        objects with this method, counting the ones generated before a `resume`.
+
+        Every `checkpoint_every` objects, once the consumer has processed them,
+        `on_checkpoint` is called with the state of this `Rsg`. A crashed job can then
+        be continued with `resume`, generating the same objects that it would have
+        generated uninterrupted, after discarding the output past the checkpoint
+        `index`.
+
+        Args:
+            n (Optional[int], optional): The total number of objects, None for an
+            endless stream. Defaults to None.
+            checkpoint_every (int, optional): The number of objects between two
+            checkpoints. Defaults to 1000.
+            on_checkpoint (Optional[Callable[[dict[str, Any]], None]], optional):
+            Called with the state returned by `getstate` at every checkpoint. Defaults
+            to None.
+
+        Raises:
+            ValueError: If `checkpoint_every` is lower than 1.
+
+        Returns:
+            Iterator[Any]: The generated objects.
+        """
+        if checkpoint_every < 1:
+            raise ValueError(
+                f"checkpoint_every must be at least 1, got {checkpoint_every}"
+            )
+        rsg = self._thread_rsg()
+        return rsg._generate_stream(n, checkpoint_every, on_checkpoint)
+
+    def _generate_stream(
+        self,
+        n: Optional[int],
+        checkpoint_every: int,
+        on_checkpoint: Optional[Callable[[dict[str, Any]], None]],
+    ) -> Iterator[Any]:
+        while n is None or self._index < n:
+            res = self._generate()
+            self._index += 1
+            yield res
+            if on_checkpoint is not None and self._index % checkpoint_every == 0:
+                on_checkpoint(self.getstate())
 
     def __next__(self) -> Any:
         """Alias for `generate`"""
@@ -305,18 +1184,25 @@ class Rsg(metaclass=RsgMeta):
 
 
 class RsgStr(Rsg):
-    """Rsg for random strings of letters, digits and punctuations
+    """Rsg for random strings, of letters, digits and punctuations by default.
 
     Args:
         min_str_len (int, optional): Minimum string length. Defaults to 4.
         max_str_len (int, optional): Maximum string length. Defaults to 10.
+        str_charset (str, optional): The characters to choose from, only latin-1
+        characters are supported. Defaults to `RsgStr.CHARSET`.
     """
 
+    CHARSET = string.ascii_letters + string.digits + string.punctuation
+
     @generator("str")
-    def _generate_str(self, min_str_len: int = 4, max_str_len: int = 10) -> str:
-        n = randint(min_str_len, max_str_len)
-        charset = string.ascii_letters + string.digits + string.punctuation
-        return "".join(choices(charset, k=n))
+    def _generate_str(
+        self, min_str_len: int = 4, max_str_len: int = 10, str_charset: str = CHARSET
+    ) -> str:
+        if self._leaf_backend is not None:
+            return self._leaf_backend.strings(min_str_len, max_str_len, str_charset)
+        n = self.rng.randint(min_str_len, max_str_len)
+        return self._strings.string(n, Charset.get(str_charset))
 
 
 class RsgFloat(Rsg):
@@ -328,7 +1214,9 @@ class RsgFloat(Rsg):
 
     @generator("float")
     def _generate_float(self, max_float_val: float = 1.0) -> float:
-        return random() * max_float_val
+        if self._leaf_backend is not None:
+            return self._leaf_backend.floats(max_float_val)
+        return self.rng.random() * max_float_val
 
 
 class RsgInt(Rsg):
@@ -340,42 +1228,72 @@ class RsgInt(Rsg):
 
     @generator("int")
     def _generate_int(self, max_int_val: int = 1000) -> int:
-        return randint(0, max_int_val)
+        if self._leaf_backend is not None:
+            return self._leaf_backend.integers(max_int_val)
+        return self.rng.randint(0, max_int_val)
 
 
 class RsgDict(Rsg):
-    """Rsg for random dictionaries, keys are valid python identifiers.
+    """Rsg for random dictionaries, keys are valid python identifiers by default.
 
     Args:
         min_key_len (int, optional): Minimum key length. Defaults to 4.
         max_key_len (int, optional): Maximum key length. Defaults to 10.
+        key_charset (str, optional): The characters of the keys, only latin-1
+        characters are supported. Defaults to `RsgDict.KEY_CHARSET`.
+        key_head_charset (str, optional): The characters of the first character of
+        the keys. Defaults to `RsgDict.KEY_HEAD_CHARSET`.
     """
 
-    @generator("dict")
+    KEY_CHARSET = string.ascii_letters + string.digits + "_"
+    KEY_HEAD_CHARSET = string.ascii_letters
+
+    @generator("dict", container="dict")
     def _generate_dict(
-        self, children: Iterable[Any], min_key_len: int = 4, max_key_len: int = 10
+        self,
+        children: Iterable[Any],
+        min_key_len: int = 4,
+        max_key_len: int = 10,
+        key_charset: str = KEY_CHARSET,
+        key_head_charset: str = KEY_HEAD_CHARSET,
     ) -> dict:
-        def _generate_key() -> str:
-            n = randint(min_key_len, max_key_len)
-            charset = string.ascii_letters + string.digits + "_"
-            return choice(string.ascii_letters) + "".join(choices(charset, k=n - 1))
+        key_args = (min_key_len, max_key_len, key_charset, key_head_charset)
+        if self._pools is not None:
+            pool = self._pool("dict.key")
+            return {pool.draw(self._generate_key, *key_args): x for x in children}
+        return {self._generate_key(*key_args): x for x in children}
 
-        return {_generate_key(): x for x in children}
+    def _generate_key(
+        self,
+        min_key_len: int = 4,
+        max_key_len: int = 10,
+        key_charset: str = KEY_CHARSET,
+        key_head_charset: str = KEY_HEAD_CHARSET,
+    ) -> str:
+        n = self.rng.randint(min_key_len, max_key_len)
+        strings = self._strings
+        return strings.string(1, Charset.get(key_head_charset)) + strings.string(
+            max(n - 1, 0), Charset.get(key_charset)
+        )
 
 
 class RsgList(Rsg):
     """Rsg for random lists."""
 
-    @generator("list")
+    @generator("list", container="list")
     def _generate_list(self, children: Iterable[Any]) -> list:
+        if self.lazy_children:
+            return LazyList(children)
         return list(children)
 
 
 class RsgTuple(Rsg):
     """Rsg for random tuples."""
 
-    @generator("tuple")
+    @generator("tuple", container="tuple")
     def _generate_tuple(self, children: Iterable[Any]) -> tuple:
+        if self.lazy_children:
+            return LazyTuple(children)
         return tuple(children)
 
 
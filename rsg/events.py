@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+from enum import Enum
+from typing import Any, Iterable, Iterator, NamedTuple, TextIO
+
+from rsg.core import Rsg, _GeneratorFn
+
+
+class EventType(Enum):
+    """Types of the events produced by `Rsg.events`."""
+
+    START_LIST = "start_list"
+    END_LIST = "end_list"
+    START_TUPLE = "start_tuple"
+    END_TUPLE = "end_tuple"
+    START_DICT = "start_dict"
+    END_DICT = "end_dict"
+    KEY = "key"
+    LEAF = "leaf"
+
+
+class Event(NamedTuple):
+    """A generation event: container events have a None value, `KEY` events carry the
+    dict key of the next child and `LEAF` events carry a leaf object.
+    """
+
+    type: EventType
+    value: Any = None
+
+
+_CONTAINER_EVENTS = {
+    "list": (Event(EventType.START_LIST), Event(EventType.END_LIST)),
+    "tuple": (Event(EventType.START_TUPLE), Event(EventType.END_TUPLE)),
+    "dict": (Event(EventType.START_DICT), Event(EventType.END_DICT)),
+}
+
+_EMPTY_CONTAINERS = {"list": [], "tuple": (), "dict": {}}
+
+
+def iter_events(rsg: Rsg) -> Iterator[Event]:
+    """Generate a random object as a depth-first stream of events, without ever
+    holding the whole object in memory.
+
+    Composite generator methods declared with a `container` (like the built-in list,
+    tuple and dict generators) are streamed as a start event, the events of their
+    children (each preceded by a `KEY` event for dicts) and an end event. Leaves and
+    custom composite methods are materialized and emitted as a single `LEAF` event.
+    The objects are the same as the ones of `Rsg.generate`: as dict methods draw their
+    keys after their children, the events of the children of a dict are buffered
+    until the method is called with the indices of the children as values.
+    Budgets (`max_nodes`, `max_bytes`) are enforced like in `Rsg.generate`: when
+    they run out, leaf generators are preferred and the remaining children of
+    containers are truncated. Streamed containers are accounted for as empty ones by
+    the memory budget. Hooks are called around streamed containers as well, with a
+    None value on exit, which happens before the end event is emitted.
+
+    Args:
+        rsg (Rsg): The generator.
+
+    Raises:
+        ValueError: If the `Rsg` uses structural sharing, as shared subtrees would be
+        streamed in full every time they are referenced.
+
+    Returns:
+        Iterator[Event]: The generation events.
+    """
+    if rsg._shared is not None:
+        raise ValueError("Structural sharing is not supported by event streams")
+    return _events(rsg)
+
+
+def _events(rsg: Rsg) -> Iterator[Event]:
+    budget = rsg._budget
+    if budget is None or budget.active:
+        yield from _fn_events(rsg, _sample_fn(rsg))
+        return
+
+    budget.reset()
+    budget.active = True
+    try:
+        yield from _fn_events(rsg, _sample_fn(rsg))
+    finally:
+        budget.active = False
+
+
+def _sample_fn(rsg: Rsg) -> _GeneratorFn:
+    # Same choice as `Rsg._generate_budgeted`: leaves only once the budget runs out.
+    budget = rsg._budget
+    if budget is not None and budget.exhausted and rsg._leaf_fn_table is not None:
+        return rsg._leaf_fn_table.sample(rsg.rng)
+    return rsg._gen_fn_table.sample(rsg.rng)
+
+
+def _fn_events(rsg: Rsg, fn: _GeneratorFn) -> Iterator[Event]:
+    budget = rsg._budget
+    if fn.container is None:
+        value = rsg._gen_compiled[fn](rsg)
+        if budget is not None:
+            budget.add(value)
+        yield Event(EventType.LEAF, value)
+        return
+
+    start, end = _CONTAINER_EVENTS[fn.container]
+    hook = rsg.hook
+    if hook is None:
+        yield from _container_events(rsg, fn, start)
+        yield end
+        return
+
+    depth = rsg._depth
+    hook.on_enter(fn.name, depth)
+    try:
+        yield from _container_events(rsg, fn, start)
+    except BaseException as e:
+        hook.on_error(fn.name, depth, e)
+        raise
+    hook.on_exit(fn.name, depth, None)
+    yield end
+
+
+def _container_events(rsg: Rsg, fn: _GeneratorFn, start: Event) -> Iterator[Event]:
+    # The events of a streamed container, except its end event.
+    budget = rsg._budget
+    yield start
+
+    n = rsg._children_count()
+    fns = ()
+    if n > 0:
+        child = rsg.child
+        if budget is None:
+            fns = child._gen_fn_table.sample_many(child.rng, n)
+        else:
+            # Sampled one at a time, as the budget may run out between siblings.
+            fns = (_sample_fn(child) for _ in range(n))
+
+    if fn.container == "dict":
+        # Like `Rsg.generate`, keys are drawn by the dict method after all the
+        # children, so children are buffered and the method maps their indices to
+        # their keys, including duplicate keys and leaf pools.
+        children = [list(_fn_events(child, x)) for x in fns]
+        args, kwargs = fn.resolve(rsg)
+        indices = fn.method(rsg, *args, children=range(len(children)), **kwargs)
+        for key, i in indices.items():
+            yield Event(EventType.KEY, key)
+            yield from children[i]
+    else:
+        for x in fns:
+            yield from _fn_events(child, x)
+
+    if budget is not None:
+        budget.add(_EMPTY_CONTAINERS[fn.container])
+
+
+def dump_json(events: Iterable[Event], fp: TextIO) -> None:
+    """Writes a stream of events to a file as JSON, one event at a time. Tuples are
+    written as JSON arrays and leaves that are not JSON serializable are written as
+    their `repr`.
+
+    Args:
+        events (Iterable[Event]): The events, e.g. from `Rsg.events`.
+        fp (TextIO): The output text file.
+    """
+    # One entry per open container: True until its first child has been written.
+    first: list[bool] = []
+    after_key = False
+
+    for event in events:
+        etype = event.type
+        if etype in (EventType.END_LIST, EventType.END_TUPLE, EventType.END_DICT):
+            first.pop()
+            fp.write("}" if etype is EventType.END_DICT else "]")
+            continue
+
+        if first and not after_key:
+            if not first[-1]:
+                fp.write(",")
+            first[-1] = False
+        after_key = False
+
+        if etype is EventType.KEY:
+            fp.write(json.dumps(str(event.value)))
+            fp.write(":")
+            after_key = True
+        elif etype is EventType.LEAF:
+            fp.write(json.dumps(event.value, default=repr))
+        else:
+            first.append(True)
+            fp.write("{" if etype is EventType.START_DICT else "[")
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from rsg.core import Rsg
+
+
+class GenerationHook:
+    """Base class for hooks called when entering and exiting every generator method of
+    an `Rsg`. Children of composite methods are generated between the enter and exit
+    calls of their parent. Hooks are installed when the `Rsg` is constructed, so
+    generators without hooks pay no overhead.
+    """
+
+    def on_enter(self, name: str, depth: int) -> None:
+        """Called before a generator method is invoked.
+
+        Args:
+            name (str): The name of the generator method.
+            depth (int): The depth of the generated node, 0 for the root.
+        """
+
+    def on_exit(self, name: str, depth: int, value: Any) -> None:
+        """Called after a generator method returns.
+
+        Args:
+            name (str): The name of the generator method.
+            depth (int): The depth of the generated node, 0 for the root.
+            value (Any): The generated object.
+        """
+
+    def on_error(self, name: str, depth: int, error: BaseException) -> None:
+        """Called instead of `on_exit` when a generator method raises an exception,
+        which is then propagated.
+
+        Args:
+            name (str): The name of the generator method.
+            depth (int): The depth of the node, 0 for the root.
+            error (BaseException): The raised exception.
+        """
+
+    def on_children(self, depth: int, n: int) -> None:
+        """Called when the number of children of a composite node is drawn, between
+        the enter and exit calls of the node.
+
+        Args:
+            depth (int): The depth of the composite node, 0 for the root.
+            n (int): The number of children.
+        """
+
+    def fork(self) -> Optional[GenerationHook]:
+        """Returns an empty hook with the same settings as this hook, to be used by
+        another worker, e.g. by `generate_parallel`. Its results are then added to the
+        ones of this hook with `merge`. Hooks that cannot be merged return None.
+
+        Returns:
+            Optional[GenerationHook]: The new hook, or None.
+        """
+        return None
+
+    def merge(self, other: GenerationHook) -> None:
+        """Adds the results of a hook returned by `fork` to the ones of this hook.
+
+        Args:
+            other (GenerationHook): The other hook.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot be merged")
+
+    def wrap(self, name: str, call: Callable[[Rsg], Any]) -> Callable[[Rsg], Any]:
+        """Wraps a compiled generator method with the calls to this hook.
+
+        Args:
+            name (str): The name of the generator method.
+            call (Callable[[Rsg], Any]): The compiled generator method.
+
+        Returns:
+            Callable[[Rsg], Any]: The wrapped generator method.
+        """
+        on_enter, on_exit, on_error = self.on_enter, self.on_exit, self.on_error
+
+        def _call(caller: Rsg) -> Any:
+            depth = caller._depth
+            on_enter(name, depth)
+            try:
+                value = call(caller)
+            except BaseException as e:
+                on_error(name, depth, e)
+                raise
+            on_exit(name, depth, value)
+            return value
+
+        return _call
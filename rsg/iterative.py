@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from rsg.core import Rsg
+from rsg.hooks import GenerationHook
+
+
+def generate_iterative(rsg: Rsg) -> Any:
+    """Generate a random object walking the structure with an explicit stack instead
+    of recursion, so that `max_depth` is not bound by the recursion limit and no
+    Python frames are spent per level. Composite generator methods are called once all
+    their children are generated, leaves are generated as soon as they are drawn.
+
+    The random draws happen in the same order as in `Rsg.generate`, so both generate
+    the same objects from the same seed. Lazy children, budgets, structural sharing
+    and async generator methods are not supported.
+
+    Args:
+        rsg (Rsg): The generator.
+
+    Raises:
+        ValueError: If the `Rsg` uses an unsupported feature.
+
+    Returns:
+        Any: The generated object
+    """
+    if (
+        rsg.lazy_children
+        or rsg._budget is not None
+        or rsg._shared is not None
+        or rsg._is_async
+    ):
+        raise ValueError(
+            "Lazy children, budgets, structural sharing and async generators are not "
+            "supported by the iterative engine"
+        )
+    hook = rsg.hook
+    root = rsg._gen_fn_table.sample(rsg.rng)
+
+    # Frames: [level Rsg, generator fns of the children, index of the next child,
+    # generated children, parent generator fn, parent level Rsg]
+    stack: list[list] = [[rsg, (root,), 0, [], None, None]]
+    try:
+        return _run(stack, hook)
+    except BaseException as e:
+        # Composite methods still on the stack were entered but will never exit.
+        if hook is not None:
+            for frame in reversed(stack):
+                if frame[4] is not None:
+                    hook.on_error(frame[4].name, frame[5]._depth, e)
+        raise
+
+
+def _run(stack: list[list], hook: Optional[GenerationHook]) -> Any:
+    # Frames are popped once their composite method returns, so that the stack holds
+    # all the entered composite methods when an exception is raised.
+    while True:
+        frame = stack[-1]
+        level, fns, index, values = frame[0], frame[1], frame[2], frame[3]
+
+        if index < len(fns):
+            frame[2] = index + 1
+            fn = fns[index]
+            if fn.is_leaf:
+                values.append(level._gen_compiled[fn](level))
+                continue
+
+            if hook is not None:
+                hook.on_enter(fn.name, level._depth)
+            n = level._children_count()
+            child = level.child
+            child_fns = child._gen_fn_table.sample_many(child.rng, n)
+            stack.append([child, child_fns, 0, [], fn, level])
+            continue
+
+        if len(stack) == 1:
+            return values[0]
+
+        fn, parent = frame[4], frame[5]
+        method, args, kwargs = parent._levels[parent._level_index].resolved[fn]
+        value = method(parent, *args, children=values, **kwargs)
+        stack.pop()
+        if hook is not None:
+            hook.on_exit(fn.name, parent._depth, value)
+        stack[-1][3].append(value)
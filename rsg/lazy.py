@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:  # pragma: no cover
+    from rsg.core import Rsg
+
+
+class LazyChildren(Iterator):
+    """Iterator over a known number of children objects, each one generated by the
+    child `Rsg` only when requested.
+    """
+
+    __slots__ = ("_rsg", "_n")
+
+    def __init__(self, rsg: Rsg, n: int) -> None:
+        """Constructor for `LazyChildren`.
+
+        Args:
+            rsg (Rsg): The `Rsg` generating the children.
+            n (int): The number of children.
+        """
+        self._rsg = rsg
+        self._n = n
+
+    def __len__(self) -> int:
+        """The number of children yet to be generated."""
+        return self._n
+
+    def __next__(self) -> Any:
+        if self._n <= 0:
+            raise StopIteration
+        self._n -= 1
+        return self._rsg._generate()
+
+
+class LazyList(Sequence):
+    """Read-only list proxy that materializes its elements from an iterable only when
+    they are accessed. Elements are materialized in order, so accessing the i-th
+    element materializes all the preceding ones too.
+    """
+
+    def __init__(self, iterable: Iterable[Any]) -> None:
+        """Constructor for `LazyList`.
+
+        Args:
+            iterable (Iterable[Any]): The elements. If it has a length (like
+            `LazyChildren`), `len` does not materialize any element.
+        """
+        self._items: list[Any] = []
+        self._it = iter(iterable)
+        self._len = len(iterable) if hasattr(iterable, "__len__") else None
+
+    @property
+    def materialized(self) -> int:
+        """The number of materialized elements."""
+        return len(self._items)
+
+    def _materialize(self, n: int = -1) -> None:
+        # Materializes elements until there are at least n of them, all if n < 0.
+        items, it = self._items, self._it
+        if it is None:
+            return
+        while n < 0 or len(items) < n:
+            try:
+                items.append(next(it))
+            except StopIteration:
+                self._it = None
+                self._len = len(items)
+                return
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice) or index < 0:
+            self._materialize()
+        else:
+            self._materialize(index + 1)
+        return self._items[index]
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._materialize()
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        i = 0
+        while True:
+            self._materialize(i + 1)
+            if i >= len(self._items):
+                return
+            yield self._items[i]
+            i += 1
+
+    def __eq__(self, __o: object) -> bool:
+        if isinstance(__o, (LazyList, list)):
+            return list(self) == list(__o)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        self._materialize()
+        return f"{self.__class__.__name__}({self._items!r})"
+
+
+class LazyTuple(LazyList):
+    """Read-only tuple proxy that materializes its elements only when they are
+    accessed, see `LazyList`.
+    """
+
+    def __eq__(self, __o: object) -> bool:
+        if isinstance(__o, (LazyTuple, tuple)):
+            return tuple(self) == tuple(__o)
+        return NotImplemented
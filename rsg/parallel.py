@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import os
+import sys
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import lru_cache
+from typing import Any, Iterator, Optional, Union
+
+from rsg.core import Rsg
+from rsg.hooks import GenerationHook
+from rsg.utils.helpers import derive_seed
+
+_class_spec_t = Union[type, tuple]
+
+# Class attributes that do not prevent a class from being rebuilt from its bases.
+_COMPOSITE_ATTRS = {
+    "__module__",
+    "__qualname__",
+    "__doc__",
+    "__dict__",
+    "__weakref__",
+    "__abstractmethods__",
+    "_abc_impl",
+    "_generators_map",
+    "_generators",
+    "_own_generators",
+}
+
+
+def _class_spec(cls: type) -> _class_spec_t:
+    """Returns a picklable reference to an `Rsg` class. Importable classes are pickled
+    by reference, while classes that are dynamically composed from other `Rsg`
+    classes (mixins with no members of their own) are rebuilt from their bases.
+
+    Args:
+        cls (type): The `Rsg` class.
+
+    Raises:
+        TypeError: If the class is neither importable nor a pure composition.
+
+    Returns:
+        _class_spec_t: The class itself or a (name, bases) tuple.
+    """
+    obj = sys.modules.get(cls.__module__)
+    for part in cls.__qualname__.split("."):
+        obj = getattr(obj, part, None)
+    if obj is cls:
+        return cls
+
+    if set(vars(cls)) - _COMPOSITE_ATTRS:
+        raise TypeError(
+            f"Cannot send {cls.__qualname__} to worker processes: define it at module "
+            "level or compose it from importable Rsg classes only"
+        )
+    return (cls.__name__, tuple(_class_spec(x) for x in cls.__bases__))
+
+
+@lru_cache(maxsize=None)
+def _load_class(spec: _class_spec_t) -> type:
+    if isinstance(spec, type):
+        return spec
+    name, bases = spec
+    bases = tuple(_load_class(x) for x in bases)
+    return type(bases[0])(name, bases, {})
+
+
+def _generate_chunk(
+    spec: _class_spec_t, config: dict[str, Any], seed: int, size: int
+) -> tuple[list[Any], Optional[GenerationHook]]:
+    # Returns the hook of the chunk with the objects, to be merged by the caller.
+    rsg = _load_class(spec)(seed=seed, **config)
+    return rsg.generate_many(size), rsg.hook
+
+
+def _fork_hook(rsg: Rsg) -> Optional[GenerationHook]:
+    # Returns an empty copy of the hook of `rsg` for a chunk, see `GenerationHook.fork`.
+    if rsg.hook is None:
+        return None
+    hook = rsg.hook.fork()
+    if hook is None:
+        raise ValueError(
+            f"{type(rsg.hook).__name__} cannot be used by several workers, as it "
+            "cannot be merged, see GenerationHook.fork"
+        )
+    return hook
+
+
+def _chunks(n: int, chunksize: int) -> Iterator[tuple[int, int]]:
+    # (index, size) of the chunks of n objects.
+    for i, start in enumerate(range(0, max(n, 0), chunksize)):
+        yield i, min(chunksize, n - start)
+
+
+def generate_threaded(
+    rsg: Rsg, n: int, threads: Optional[int] = None, chunksize: int = 1000
+) -> list[Any]:
+    """Generate `n` random objects with a pool of threads. Useful on free-threaded
+    Python builds, or when generator methods release the GIL.
+
+    Like `generate_parallel`, every chunk is generated by `rsg.substream(i)`, so that
+    each thread owns its random number generator, string buffers, budget, leaf pools
+    and subtree caches while sharing the immutable level table. The output is the same
+    as the one of `generate_parallel` with the same `chunksize` and does not depend on
+    the number of threads. A hook of `rsg` is forked for every chunk and the results
+    are merged into it, in chunk order.
+
+    Args:
+        rsg (Rsg): The generator.
+        n (int): The number of objects to generate.
+        threads (Optional[int], optional): The number of threads, if None it defaults
+        to the number of processors. Defaults to None.
+        chunksize (int, optional): The number of objects per chunk. Defaults to 1000.
+
+    Raises:
+        ValueError: If `rsg` has a hook that cannot be merged.
+
+    Returns:
+        list[Any]: The generated objects.
+    """
+    cls, config, seed = type(rsg), rsg.config, rsg.root_seed
+    chunks = [(i, size, _fork_hook(rsg)) for i, size in _chunks(n, chunksize)]
+
+    def _chunk(chunk: tuple[int, int, Optional[GenerationHook]]) -> list[Any]:
+        # Same as `rsg.substream(i)`, but created by the thread that uses it, which
+        # then owns its generation state, see `Rsg._thread_rsg`.
+        i, size, hook = chunk
+        kwargs = dict(config, hook=hook)
+        return cls(seed=derive_seed(seed, i), **kwargs).generate_many(size)
+
+    with ThreadPoolExecutor(threads or os.cpu_count() or 1) as executor:
+        res = list(executor.map(_chunk, chunks))
+    if rsg.hook is not None:
+        for _, _, hook in chunks:
+            rsg.hook.merge(hook)
+    return [x for chunk in res for x in chunk]
+
+
+def generate_parallel(
+    rsg: Rsg,
+    n: int,
+    workers: Optional[int] = None,
+    chunksize: int = 1000,
+    ordered: bool = True,
+) -> Iterator[Any]:
+    """Generate `n` random objects with a pool of worker processes.
+
+    Objects are generated in chunks of `chunksize`. Every chunk is generated by a
+    fresh copy of `rsg` seeded with `rsg.substream(i)` seeds, so the output does not
+    depend on the number of workers and chunk `i` is always the same as
+    `rsg.substream(i).generate_many(chunksize)`. Only a bounded number of chunks are
+    in flight at any time, so that results can be consumed as a stream.
+
+    A hook of `rsg` is forked for every chunk, see `GenerationHook.fork`, and the
+    results of the workers are merged into it as their chunks are yielded.
+
+    Args:
+        rsg (Rsg): The generator, its class must be importable or composed of
+        importable classes and its constructor arguments must be picklable.
+        n (int): The number of objects to generate.
+        workers (Optional[int], optional): The number of worker processes, if None
+        it defaults to the number of processors. Defaults to None.
+        chunksize (int, optional): The number of objects per chunk. Defaults to 1000.
+        ordered (bool, optional): True to yield the objects in chunk order, False to
+        yield chunks as soon as they are completed. Defaults to True.
+
+    Raises:
+        ValueError: If `rsg` has a hook that cannot be merged, as every worker would
+        call its own copy and its results would be lost.
+
+    Returns:
+        Iterator[Any]: The generated objects.
+    """
+    _fork_hook(rsg)
+    spec = _class_spec(type(rsg))
+    return _generate_parallel(
+        rsg, spec, n, workers or os.cpu_count() or 1, chunksize, ordered
+    )
+
+
+def _generate_parallel(
+    rsg: Rsg,
+    spec: _class_spec_t,
+    n: int,
+    workers: int,
+    chunksize: int,
+    ordered: bool,
+) -> Iterator[Any]:
+    config, seed = rsg.config, rsg.root_seed
+    chunks = _chunks(n, chunksize)
+
+    with ProcessPoolExecutor(workers) as executor:
+        max_pending = 2 * workers
+        pending: deque[Future] = deque()
+
+        def _submit() -> None:
+            while len(pending) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                i, size = chunk
+                kwargs = dict(config, hook=_fork_hook(rsg))
+                fut = executor.submit(
+                    _generate_chunk, spec, kwargs, derive_seed(seed, i), size
+                )
+                pending.append(fut)
+
+        _submit()
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    pending.remove(fut)
+            for fut in done:
+                objects, hook = fut.result()
+                if hook is not None:
+                    rsg.hook.merge(hook)
+                yield from objects
+            _submit()
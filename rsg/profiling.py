@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, NamedTuple
+
+from rsg.hooks import GenerationHook
+
+
+class ProfileEntry(NamedTuple):
+    """Statistics of a generator method, at a given depth or at all depths.
+
+    Attributes:
+        name (str): The name of the generator method.
+        depth (int): The depth of the generated nodes, -1 for all depths.
+        calls (int): Number of invocations.
+        total_time (float): Cumulative time, including children, in seconds.
+        self_time (float): Cumulative time, excluding children, in seconds.
+        nodes (int): Number of generated nodes, including children.
+    """
+
+    name: str
+    depth: int
+    calls: int
+    total_time: float
+    self_time: float
+    nodes: int
+
+
+class ProfileReport:
+    """Per generator method and per depth statistics collected by a `Profiler`."""
+
+    def __init__(self, entries: list[ProfileEntry]) -> None:
+        self._entries = sorted(entries, key=lambda x: (x.name, x.depth))
+
+    @property
+    def entries(self) -> list[ProfileEntry]:
+        """The statistics of every generator method at every depth."""
+        return list(self._entries)
+
+    def by_name(self) -> dict[str, ProfileEntry]:
+        """Aggregates the statistics of every generator method over all depths.
+
+        Returns:
+            dict[str, ProfileEntry]: The statistics, by generator method name.
+        """
+        res: dict[str, ProfileEntry] = {}
+        for x in self._entries:
+            prev = res.get(x.name, ProfileEntry(x.name, -1, 0, 0.0, 0.0, 0))
+            res[x.name] = ProfileEntry(
+                x.name,
+                -1,
+                prev.calls + x.calls,
+                prev.total_time + x.total_time,
+                prev.self_time + x.self_time,
+                prev.nodes + x.nodes,
+            )
+        return res
+
+    def __str__(self) -> str:
+        rows = [f"{'name':<20}{'depth':>6}{'calls':>10}{'total s':>12}{'self s':>12}"]
+        for x in sorted(self._entries, key=lambda x: -x.self_time):
+            rows.append(
+                f"{x.name:<20}{x.depth:>6}{x.calls:>10}"
+                f"{x.total_time:>12.6f}{x.self_time:>12.6f}"
+            )
+        return "\n".join(rows)
+
+
+class Profiler(GenerationHook):
+    """Hook that measures invocations, cumulative and self time and generated nodes
+    of every generator method, at every depth.
+
+    Example:
+        Pass a profiler to an `Rsg` and print its report::
+
+            profiler = Profiler()
+            rsg = RsgBase(max_depth=3, max_breadth=4, hook=profiler)
+            rsg.generate_many(1000)
+            print(profiler.report())
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        """Constructor for `Profiler`.
+
+        Args:
+            clock (Callable[[], float], optional): The clock, in seconds. Defaults to
+            `time.perf_counter`.
+        """
+        self._clock = clock
+        # Open invocations: [start time, children time, children nodes]
+        self._stack: list[list] = []
+        # (name, depth) -> [calls, total time, self time, nodes]
+        self._stats: dict[tuple[str, int], list] = {}
+
+    def on_enter(self, name: str, depth: int) -> None:
+        self._stack.append([self._clock(), 0.0, 0])
+
+    def on_exit(self, name: str, depth: int, value: Any) -> None:
+        start, children_time, children_nodes = self._stack.pop()
+        elapsed = self._clock() - start
+        nodes = children_nodes + 1
+
+        stats = self._stats.get((name, depth))
+        if stats is None:
+            stats = self._stats[(name, depth)] = [0, 0.0, 0.0, 0]
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] += elapsed - children_time
+        stats[3] += nodes
+
+        if self._stack:
+            parent = self._stack[-1]
+            parent[1] += elapsed
+            parent[2] += nodes
+
+    def on_error(self, name: str, depth: int, error: BaseException) -> None:
+        # Failed invocations are not recorded, their time counts as self time of the
+        # parent.
+        self._stack.pop()
+
+    def reset(self) -> None:
+        """Discards all the collected statistics."""
+        self._stack.clear()
+        self._stats.clear()
+
+    def fork(self) -> Profiler:
+        return Profiler(self._clock)
+
+    def merge(self, other: Profiler) -> None:
+        for key, values in other._stats.items():
+            stats = self._stats.get(key)
+            if stats is None:
+                self._stats[key] = list(values)
+            else:
+                for i, value in enumerate(values):
+                    stats[i] += value
+
+    def report(self) -> ProfileReport:
+        """Returns the collected statistics.
+
+        Returns:
+            ProfileReport: The statistics report.
+        """
+        return ProfileReport(
+            [ProfileEntry(k[0], k[1], *v) for k, v in self._stats.items()]
+        )
@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import heapq
+import math
+from collections import Counter
+from operator import add
+from random import Random
+from typing import Any, Mapping, Optional
+
+from rsg.core import Rsg
+from rsg.hooks import GenerationHook
+from rsg.utils.helpers import make_attrs
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Approximate memory of a node produced by a generator method, in bytes, as a
+# (base, per child) pair. Strings assume the default length of `RsgStr`.
+DEFAULT_NODE_BYTES: dict[str, tuple[float, float]] = {
+    "int": (28, 0),
+    "float": (24, 0),
+    "str": (56, 0),
+    "list": (56, 8),
+    "tuple": (40, 8),
+    "dict": (64, 100),
+    "default": (16, 0),
+}
+UNKNOWN_NODE_BYTES = (64, 8)
+
+
+class Estimate:
+    """Expected size of the structures generated by an `Rsg`, see `estimate`.
+
+    Attributes:
+        nodes_mean (float): Expected number of nodes per structure.
+        nodes_std (float): Standard deviation of the number of nodes per structure.
+        nodes_max (float): Maximum number of nodes per structure.
+        depth_nodes (list[float]): Expected number of nodes at every depth.
+        generator_nodes (dict[str, float]): Expected number of nodes produced by
+        every generator method.
+        bytes_mean (float): Approximate expected memory per structure, in bytes.
+        nodes_pmf (list[float]): Probability of every number of nodes per structure,
+        up to `len(nodes_pmf) - 1` nodes, the remaining probability is the one of
+        larger structures.
+    """
+
+    def __init__(
+        self,
+        nodes_mean: float,
+        nodes_std: float,
+        nodes_max: float,
+        depth_nodes: list[float],
+        generator_nodes: dict[str, float],
+        bytes_mean: float,
+        nodes_pmf: list[float],
+    ) -> None:
+        make_attrs(self, locals())
+
+    @property
+    def generator_mix(self) -> dict[str, float]:
+        """Expected fraction of nodes produced by every generator method."""
+        return {k: v / self.nodes_mean for k, v in self.generator_nodes.items()}
+
+    def nodes_quantile(self, q: float = 0.99) -> float:
+        """The q-quantile of the number of nodes per structure, from the exact
+        distribution `nodes_pmf`. If the quantile lies beyond the computed
+        distribution, falls back to `nodes_upper_bound`.
+
+        Args:
+            q (float, optional): The quantile, in [0, 1). Defaults to 0.99.
+
+        Returns:
+            float: The quantile.
+        """
+        cum = 0.0
+        for nodes, p in enumerate(self.nodes_pmf):
+            cum += p
+            if cum >= q:
+                return nodes
+        return self.nodes_upper_bound(q)
+
+    def bytes_quantile(self, q: float = 0.99) -> float:
+        """Approximate q-quantile of the memory per structure, proportional to
+        `nodes_quantile`.
+
+        Args:
+            q (float, optional): The quantile, in [0, 1). Defaults to 0.99.
+
+        Returns:
+            float: The quantile, in bytes.
+        """
+        return self.bytes_mean * self.nodes_quantile(q) / self.nodes_mean
+
+    def nodes_upper_bound(self, q: float = 0.99) -> float:
+        """Upper bound of the q-quantile of the number of nodes per structure, from
+        Cantelli's inequality. It holds for any distribution, so it is loose: it is
+        often a few times the actual quantile, use it for sizing, not as an estimate.
+
+        Args:
+            q (float, optional): The quantile, in [0, 1). Defaults to 0.99.
+
+        Returns:
+            float: The upper bound.
+        """
+        bound = self.nodes_mean + self.nodes_std * math.sqrt(q / (1 - q))
+        return min(bound, self.nodes_max)
+
+    def bytes_upper_bound(self, q: float = 0.99) -> float:
+        """Approximate upper bound of the q-quantile of the memory per structure, see
+        `nodes_upper_bound`.
+
+        Args:
+            q (float, optional): The quantile, in [0, 1). Defaults to 0.99.
+
+        Returns:
+            float: The upper bound, in bytes.
+        """
+        return self.bytes_mean * self.nodes_upper_bound(q) / self.nodes_mean
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return (
+            f"Estimate(nodes_mean={self.nodes_mean:.1f}, "
+            f"nodes_std={self.nodes_std:.1f}, bytes_mean={self.bytes_mean:.0f})"
+        )
+
+
+def _convolve(a: list[float], b: list[float], size: int) -> list[float]:
+    # Distribution of the sum of two independent counts, truncated to `size` values.
+    if np is not None:
+        return np.convolve(a[:size], b[:size])[:size].tolist()
+    res = [0.0] * min(len(a) + len(b) - 1, size)
+    for i, x in enumerate(a[:size]):
+        if x:
+            m = min(len(b), size - i)
+            res[i : i + m] = map(add, res[i : i + m], [x * y for y in b[:m]])
+    return res
+
+
+def estimate(
+    rsg: Rsg,
+    node_bytes: Optional[Mapping[str, tuple[float, float]]] = None,
+    max_support: int = 2048,
+) -> Estimate:
+    """Computes the expected size of the structures generated by an `Rsg` in closed
+    form, without generating any of them. Budgets (`max_nodes`, `max_bytes`) are not
+    taken into account, except for capping the number of nodes.
+
+    The distribution of the number of nodes is computed bottom-up by dynamic
+    programming: the subtree of a node at a given depth is either a leaf or the sum of
+    a random number of subtrees of the next depth, whose distribution is the mixture
+    of the convolution powers of the next one.
+
+    Args:
+        rsg (Rsg): The generator.
+        node_bytes (Optional[Mapping[str, tuple[float, float]]], optional): Memory of
+        the nodes produced by every generator method, in bytes, as a (base, per child)
+        pair. Overrides `DEFAULT_NODE_BYTES`. Defaults to None.
+        max_support (int, optional): Maximum number of nodes whose probability is
+        computed, the cost of the distribution is quadratic in this number, and much
+        lower if numpy is installed. Defaults to 2048.
+
+    Returns:
+        Estimate: The size estimate.
+    """
+    costs = {**DEFAULT_NODE_BYTES, **(node_bytes or {})}
+
+    # Collect, for every level of the child chain, the probability of every generator
+    # method and the first two moments of the number of children.
+    levels = []
+    level = rsg
+    while True:
+        total = level._gen_cum_weights[-1]
+        probs = {}
+        prev = 0.0
+        for fn, cum in zip(level._gen_fns, level._gen_cum_weights):
+            probs[fn] = (cum - prev) / total
+            prev = cum
+        if level.max_depth > 0:
+            lo, hi = level.min_breadth, level.max_breadth
+            b1 = (lo + hi) / 2
+            b2 = sum(x * x for x in range(lo, hi + 1)) / (hi - lo + 1)
+        else:
+            lo, hi, b1, b2 = 0, 0, 0.0, 0.0
+        levels.append((probs, lo, hi, b1, b2))
+        if level.max_depth == 0:
+            break
+        level = level.child
+
+    # Expected nodes and bytes at every depth, top-down.
+    depth_nodes = []
+    generator_nodes: dict[str, float] = {}
+    bytes_mean = 0.0
+    expected = 1.0
+    for probs, _, _, b1, _ in levels:
+        depth_nodes.append(expected)
+        p_composite = 0.0
+        for fn, p in probs.items():
+            generator_nodes[fn.name] = generator_nodes.get(fn.name, 0.0) + expected * p
+            base, per_child = costs.get(fn.name, UNKNOWN_NODE_BYTES)
+            if fn.is_leaf:
+                bytes_mean += expected * p * base
+            else:
+                p_composite += p
+                bytes_mean += expected * p * (base + per_child * b1)
+        expected *= p_composite * b1
+
+    # Mean, variance and maximum of the nodes per structure, bottom-up. Every node
+    # has K children, with K = B if a composite method is chosen, 0 otherwise.
+    mean, var, max_nodes = 1.0, 0.0, 1.0
+    for probs, _, hi, b1, b2 in reversed(levels[:-1]):
+        p_composite = sum(p for fn, p in probs.items() if not fn.is_leaf)
+        k1, k2 = p_composite * b1, p_composite * b2
+        mean, var = 1 + k1 * mean, k1 * var + (k2 - k1 * k1) * mean * mean
+        max_nodes = 1 + (hi * max_nodes if p_composite > 0 else 0)
+
+    if rsg.max_nodes is not None:
+        max_nodes = min(max_nodes, rsg.max_nodes)
+
+    # Distribution of the nodes per structure, bottom-up, truncated past the
+    # Cantelli bound of the 0.999-quantile, which the quantiles rarely need.
+    std = math.sqrt(max(var, 0.0))
+    size = int(min(max_nodes, max_support, math.ceil(mean + 32 * std))) + 1
+    pmf = [0.0, 1.0]
+    for probs, lo, hi, _, _ in reversed(levels[:-1]):
+        p_composite = sum(p for fn, p in probs.items() if not fn.is_leaf)
+        # Distribution of the total nodes of the children: the mixture over the
+        # number of children of the convolution powers of `pmf`.
+        children, power = [0.0] * (size - 1), [1.0]
+        for k in range(hi + 1):
+            if k >= lo:
+                w = p_composite / (hi - lo + 1)
+                children[: len(power)] = [x + w * y for x, y in zip(children, power)]
+            if k < hi:
+                power = _convolve(power, pmf, size - 1)
+        pmf = [0.0, 1.0 - p_composite] + children[1:]
+        pmf[1] += children[0]
+        while len(pmf) > 1 and pmf[-1] == 0.0:
+            pmf.pop()
+    if rsg.max_nodes is not None and size > rsg.max_nodes:
+        # The budget truncates the larger structures.
+        pmf += [0.0] * (rsg.max_nodes + 1 - len(pmf))
+        pmf[-1] += max(1.0 - sum(pmf), 0.0)
+
+    return Estimate(
+        nodes_mean=mean,
+        nodes_std=std,
+        nodes_max=max_nodes,
+        depth_nodes=depth_nodes,
+        generator_nodes=generator_nodes,
+        bytes_mean=bytes_mean,
+        nodes_pmf=pmf,
+    )
+
+
+class StatsCollector(GenerationHook):
+    """Hook that accumulates statistics of the generated structures while they are
+    generated, with no extra pass over them: number of structures and nodes, nodes
+    per depth, structure heights, number of children, nodes per generator method and
+    string lengths, plus a reservoir sample of the generated strings. All the
+    aggregates take constant memory and collectors of different workers can be
+    merged.
+
+    Nodes shared by structural sharing are only counted when they are generated.
+
+    Example:
+        Pass a collector to an `Rsg` and inspect its statistics::
+
+            stats = StatsCollector()
+            rsg = RsgBase(max_depth=3, max_breadth=4, hook=stats)
+            rsg.generate_many(1000)
+            print(stats.nodes_mean, stats.depth_histogram)
+    """
+
+    def __init__(self, sample_size: int = 100, seed: Optional[int] = None) -> None:
+        """Constructor for `StatsCollector`.
+
+        Args:
+            sample_size (int, optional): Maximum number of sampled strings. Defaults
+            to 100.
+            seed (Optional[int], optional): Seed of the random number generator of the
+            reservoir sample, which is independent from the one of the `Rsg`.
+            Defaults to None.
+        """
+        self._sample_size = sample_size
+        self._rng = Random(seed)
+        self.reset()
+
+    def reset(self) -> None:
+        """Discards all the collected statistics."""
+        self.structures = 0
+        self.nodes = 0
+        self.nodes_max = 0
+        self._nodes_sq = 0
+        self.depth_histogram: Counter[int] = Counter()
+        self.height_histogram: Counter[int] = Counter()
+        self.breadth_histogram: Counter[int] = Counter()
+        self.generator_counts: Counter[str] = Counter()
+        self.str_len_histogram: Counter[int] = Counter()
+        self.str_samples: list[str] = []
+        self._str_seen = 0
+        # Nodes and height of the structure being generated.
+        self._current_nodes = 0
+        self._current_height = 0
+
+    def on_children(self, depth: int, n: int) -> None:
+        self.breadth_histogram[n] += 1
+
+    def on_exit(self, name: str, depth: int, value: Any) -> None:
+        self.generator_counts[name] += 1
+        self.depth_histogram[depth] += 1
+        self._current_nodes += 1
+        if depth > self._current_height:
+            self._current_height = depth
+
+        if type(value) is str:
+            self.str_len_histogram[len(value)] += 1
+            self._str_seen += 1
+            if len(self.str_samples) < self._sample_size:
+                self.str_samples.append(value)
+            else:
+                i = self._rng.randrange(self._str_seen)
+                if i < self._sample_size:
+                    self.str_samples[i] = value
+
+        if depth == 0:
+            nodes = self._current_nodes
+            self.structures += 1
+            self.nodes += nodes
+            self._nodes_sq += nodes * nodes
+            self.nodes_max = max(self.nodes_max, nodes)
+            self.height_histogram[self._current_height] += 1
+            self._current_nodes = self._current_height = 0
+
+    def on_error(self, name: str, depth: int, error: BaseException) -> None:
+        # A failed structure is not counted, its nodes are discarded.
+        if depth == 0:
+            self._current_nodes = self._current_height = 0
+
+    @property
+    def nodes_mean(self) -> float:
+        """Mean number of nodes per structure."""
+        return self.nodes / self.structures if self.structures > 0 else 0.0
+
+    @property
+    def nodes_std(self) -> float:
+        """Standard deviation of the number of nodes per structure."""
+        if self.structures == 0:
+            return 0.0
+        var = self._nodes_sq / self.structures - self.nodes_mean**2
+        return math.sqrt(max(var, 0.0))
+
+    def summary(self) -> dict[str, Any]:
+        """Returns the collected statistics as a JSON serializable dictionary.
+
+        Returns:
+            dict[str, Any]: The statistics.
+        """
+        return {
+            "structures": self.structures,
+            "nodes": self.nodes,
+            "nodes_mean": self.nodes_mean,
+            "nodes_std": self.nodes_std,
+            "nodes_max": self.nodes_max,
+            "depth_histogram": dict(sorted(self.depth_histogram.items())),
+            "height_histogram": dict(sorted(self.height_histogram.items())),
+            "breadth_histogram": dict(sorted(self.breadth_histogram.items())),
+            "generator_counts": dict(self.generator_counts.most_common()),
+            "str_len_histogram": dict(sorted(self.str_len_histogram.items())),
+            "str_samples": list(self.str_samples),
+        }
+
+    def fork(self) -> StatsCollector:
+        return StatsCollector(self._sample_size, seed=self._rng.getrandbits(64))
+
+    def merge(self, other: StatsCollector) -> None:
+        """Adds the statistics of another collector, e.g. of another worker, to the
+        ones of this collector. The merged string sample is a weighted reservoir
+        sample of the two samples.
+
+        Args:
+            other (StatsCollector): The other collector.
+        """
+        self.structures += other.structures
+        self.nodes += other.nodes
+        self.nodes_max = max(self.nodes_max, other.nodes_max)
+        self._nodes_sq += other._nodes_sq
+        self.depth_histogram.update(other.depth_histogram)
+        self.height_histogram.update(other.height_histogram)
+        self.breadth_histogram.update(other.breadth_histogram)
+        self.generator_counts.update(other.generator_counts)
+        self.str_len_histogram.update(other.str_len_histogram)
+
+        # Every sampled string stands for seen / len(samples) strings.
+        keyed = []
+        for samples, seen in (
+            (self.str_samples, self._str_seen),
+            (other.str_samples, other._str_seen),
+        ):
+            for x in samples:
+                keyed.append((self._rng.random() ** (len(samples) / seen), x))
+        top = heapq.nlargest(self._sample_size, keyed, key=lambda x: x[0])
+        self.str_samples = [x for _, x in top]
+        self._str_seen += other._str_seen
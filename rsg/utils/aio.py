@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+from weakref import WeakKeyDictionary
+
+
+class AsyncLimiter:
+    """Limits the number of concurrent operations, with one semaphore per event loop
+    so that the same limiter can be shared by generators running on different loops.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """Constructor for `AsyncLimiter`.
+
+        Args:
+            limit (int): Maximum number of concurrent operations.
+
+        Raises:
+            ValueError: If `limit` is lower than 1.
+        """
+        if limit < 1:
+            raise ValueError(f"The concurrency limit must be at least 1, got {limit}")
+        self._limit = limit
+        self._semaphores: WeakKeyDictionary = WeakKeyDictionary()
+
+    @property
+    def limit(self) -> int:
+        """Maximum number of concurrent operations."""
+        return self._limit
+
+    def semaphore(self) -> asyncio.Semaphore:
+        """Returns the semaphore of the running event loop.
+
+        Returns:
+            asyncio.Semaphore: The semaphore.
+        """
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(self._limit)
+        return sem
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from random import Random
+from typing import Any, Sequence
+
+
+class AliasTable:
+    """Walker/Vose alias table, to sample items with given weights in constant time,
+    regardless of the number of items, with a single random draw per sample.
+    """
+
+    __slots__ = ("_size", "_prob", "_alias", "_heads", "_tails")
+
+    def __init__(self, items: Sequence[Any], weights: Sequence[float]) -> None:
+        """Constructor for `AliasTable`.
+
+        Args:
+            items (Sequence[Any]): The items to sample.
+            weights (Sequence[float]): The relative weights of the items.
+
+        Raises:
+            ValueError: If the weights do not match the items, are negative or do not
+            sum to a positive value.
+        """
+        n, total = len(items), sum(weights)
+        if len(weights) != n:
+            raise ValueError("The number of weights does not match the items")
+        if any(x < 0 for x in weights) or not total > 0:
+            raise ValueError("Weights must be non negative with a positive total")
+
+        # Vose's algorithm: every column i holds item i with probability prob[i] and
+        # its alias otherwise.
+        scaled = [x * n / total for x in weights]
+        prob, alias = [1.0] * n, list(range(n))
+        small = [i for i, x in enumerate(scaled) if x < 1.0]
+        large = [i for i, x in enumerate(scaled) if x >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            prob[s], alias[s] = scaled[s], g
+            scaled[g] += scaled[s] - 1.0
+            (small if scaled[g] < 1.0 else large).append(g)
+
+        self._size = n
+        self._prob = prob
+        self._alias = alias
+        self._heads = list(items)
+        self._tails = [items[i] for i in alias]
+
+    def with_items(self, items: Sequence[Any]) -> AliasTable:
+        """Returns a table with the same weights, for different items.
+
+        Args:
+            items (Sequence[Any]): The new items, matching the current ones.
+
+        Returns:
+            AliasTable: The new table.
+        """
+        res = object.__new__(AliasTable)
+        res._size, res._prob, res._alias = self._size, self._prob, self._alias
+        res._heads = list(items)
+        res._tails = [items[i] for i in self._alias]
+        return res
+
+    def sample(self, rng: Random) -> Any:
+        """Samples an item.
+
+        Args:
+            rng (Random): The random number generator.
+
+        Returns:
+            Any: The sampled item.
+        """
+        u = rng.random() * self._size
+        i = int(u)
+        return self._heads[i] if u - i < self._prob[i] else self._tails[i]
+
+    def sample_many(self, rng: Random, k: int) -> list[Any]:
+        """Samples `k` items, with replacement.
+
+        Args:
+            rng (Random): The random number generator.
+            k (int): The number of samples.
+
+        Returns:
+            list[Any]: The sampled items.
+        """
+        random, n = rng.random, self._size
+        prob, heads, tails = self._prob, self._heads, self._tails
+        res = []
+        for _ in range(k):
+            u = random() * n
+            i = int(u)
+            res.append(heads[i] if u - i < prob[i] else tails[i])
+        return res
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from random import Random, getrandbits
+from typing import Any, Callable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class NumpyLeafBackend:
+    """Leaf backend that draws values in vectorized blocks with a
+    `numpy.random.Generator` and hands them out one at a time.
+
+    Every distinct set of parameters (e.g. a different `max_int_val`) gets its own
+    block, so the values follow exactly the same distribution as the ones drawn
+    from the stdlib `random` module.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        block_size: int = 4096,
+        block_chars: int = 1 << 18,
+    ) -> None:
+        """Constructor for `NumpyLeafBackend`
+
+        Args:
+            seed (Optional[int], optional): Seed of the numpy generator, if None a seed
+            is drawn from the stdlib `random` module. Defaults to None.
+            block_size (int, optional): Number of values drawn at once. Defaults to
+            4096.
+            block_chars (int, optional): Maximum number of characters drawn at once for
+            strings, so that blocks of long strings hold fewer values. Defaults to
+            262144.
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+        if np is None:
+            raise ImportError(
+                "The numpy backend requires numpy, install it with `pip install numpy`"
+            )
+        self._gen = np.random.default_rng(getrandbits(64) if seed is None else seed)
+        self._block_size = block_size
+        self._block_chars = block_chars
+        self._blocks: dict[tuple, list] = {}
+
+    def getstate(self) -> dict[str, Any]:
+        """Returns the internal state of this backend, see `setstate`.
+
+        Returns:
+            dict[str, Any]: The state of the numpy generator and of the blocks.
+        """
+        blocks = {k: list(v) for k, v in self._blocks.items()}
+        return {"gen": self._gen.bit_generator.state, "blocks": blocks}
+
+    def setstate(self, state: dict[str, Any]) -> None:
+        """Restores the internal state of this backend.
+
+        Args:
+            state (dict[str, Any]): A state returned by `getstate`.
+        """
+        self._gen.bit_generator.state = state["gen"]
+        self._blocks = {k: list(v) for k, v in state["blocks"].items()}
+
+    def _next(self, key: tuple, fill: Callable[[], list]) -> Any:
+        block = self._blocks.get(key)
+        if not block:
+            block = fill()
+            block.reverse()
+            self._blocks[key] = block
+        return block.pop()
+
+    def integers(self, high: int) -> int:
+        """Draws a uniform random integer in [0, high].
+
+        Args:
+            high (int): The maximum integer value (inclusive).
+
+        Returns:
+            int: The random integer.
+        """
+        return self._next(
+            ("int", high),
+            lambda: self._gen.integers(
+                0, high, size=self._block_size, endpoint=True
+            ).tolist(),
+        )
+
+    def floats(self, scale: float) -> float:
+        """Draws a uniform random float in [0, scale).
+
+        Args:
+            scale (float): The maximum float value (exclusive).
+
+        Returns:
+            float: The random float.
+        """
+        return self._next(
+            ("float", scale),
+            lambda: (self._gen.random(size=self._block_size) * scale).tolist(),
+        )
+
+    def strings(self, min_len: int, max_len: int, charset: str) -> str:
+        """Draws a random string with a uniform random length in [min_len, max_len]
+        and uniform random characters from a latin-1 charset.
+
+        Args:
+            min_len (int): Minimum string length.
+            max_len (int): Maximum string length.
+            charset (str): The latin-1 characters to choose from.
+
+        Returns:
+            str: The random string.
+        """
+        return self._next(
+            ("str", min_len, max_len, charset),
+            lambda: self._fill_strings(min_len, max_len, charset),
+        )
+
+    def _fill_strings(self, min_len: int, max_len: int, charset: str) -> list[str]:
+        # Characters are drawn as a fixed-width byte array, one row per string, then
+        # each row is cut to its random length. The number of rows is bounded by the
+        # total number of characters, and indices use the smallest integer type.
+        table = np.frombuffer(charset.encode("latin-1"), dtype=np.uint8)
+        width = max(max_len, 1)
+        rows = max(1, min(self._block_size, self._block_chars // width))
+        dtype = np.min_scalar_type(len(table) - 1)
+        idx = self._gen.integers(0, len(table), size=(rows, width), dtype=dtype)
+        raw = table[idx].tobytes().decode("latin-1")
+        lengths = self._gen.integers(min_len, max_len, size=rows, endpoint=True)
+        lengths = lengths.tolist()
+        return [raw[i * width : i * width + n] for i, n in enumerate(lengths)]
+
+
+def make_leaf_backend(
+    backend: Any, rng: Optional[Random] = None
+) -> Optional[NumpyLeafBackend]:
+    """Creates the leaf backend from its name. Backend instances are returned as-is,
+    so that they can be shared.
+
+    Args:
+        backend (Any): Either "random", "numpy" or a backend instance.
+        rng (Optional[Random], optional): Random number generator used to seed new
+        backends. Defaults to None.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+
+    Returns:
+        Optional[NumpyLeafBackend]: The backend instance, None for the stdlib
+        `random` module.
+    """
+    if backend is None or backend == "random":
+        return None
+    if backend == "numpy":
+        return NumpyLeafBackend(seed=None if rng is None else rng.getrandbits(64))
+    if isinstance(backend, NumpyLeafBackend):
+        return backend
+    raise ValueError(f"Unknown leaf backend: {backend}")
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sys
+from typing import Any, Optional
+
+
+class Budget:
+    """Node and memory budget of the generation of a single structure, shared by all
+    the levels of an `Rsg` child chain.
+    """
+
+    __slots__ = ("max_nodes", "max_bytes", "nodes", "bytes", "active")
+
+    def __init__(
+        self, max_nodes: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> None:
+        """Constructor for `Budget`.
+
+        Args:
+            max_nodes (Optional[int], optional): Maximum number of nodes, None for no
+            limit. Defaults to None.
+            max_bytes (Optional[int], optional): Approximate maximum memory in bytes,
+            None for no limit. Defaults to None.
+
+        Raises:
+            ValueError: If a limit is lower than 1.
+        """
+        for name, value in (("max_nodes", max_nodes), ("max_bytes", max_bytes)):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be at least 1, got {value}")
+        self.max_nodes = max_nodes
+        self.max_bytes = max_bytes
+        self.active = False
+        self.reset()
+
+    def reset(self) -> None:
+        """Starts a new structure, consisting of its root node only."""
+        self.nodes = 1
+        self.bytes = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """True if no more nodes can be generated."""
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            return True
+        return self.max_bytes is not None and self.bytes >= self.max_bytes
+
+    def take(self, n: int) -> int:
+        """Reserves up to `n` nodes.
+
+        Args:
+            n (int): The number of requested nodes.
+
+        Returns:
+            int: The number of granted nodes.
+        """
+        if self.max_bytes is not None and self.bytes >= self.max_bytes:
+            return 0
+        if self.max_nodes is not None:
+            n = max(0, min(n, self.max_nodes - self.nodes))
+        self.nodes += n
+        return n
+
+    def add(self, obj: Any) -> None:
+        """Accounts for the memory of a generated node, excluding its children.
+
+        Args:
+            obj (Any): The generated node.
+        """
+        self.bytes += sys.getsizeof(obj)
@@ -1,3 +1,4 @@
+import hashlib
 import inspect
 from typing import Any, Mapping, Callable
 
@@ -65,3 +66,18 @@ def make_attrs(
                 setattr(obj, k, v)
 
     _traverse(kwargs)
+
+
+def derive_seed(seed: int, *path: int) -> int:
+    """Deterministically derives a new 64-bit seed from a seed and a path of indices,
+    such that different paths produce unrelated seeds.
+
+    Args:
+        seed (int): The root seed.
+        *path (int): The indices identifying the derived seed.
+
+    Returns:
+        int: The derived seed.
+    """
+    data = repr((seed, *path)).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import sys
+from random import Random
+from typing import Any, Callable, NamedTuple
+
+
+class PoolPolicy(NamedTuple):
+    """Size and refresh policy of the leaf value pools of an `Rsg`.
+
+    Attributes:
+        size (int): Number of values of every pool. Defaults to 1024.
+        refresh_every (int): Number of draws after which some values of a pool are
+        replaced by fresh ones, 0 to never refresh. Defaults to 0.
+        refresh_count (int): Number of values replaced at every refresh. Defaults to 1.
+    """
+
+    size: int = 1024
+    refresh_every: int = 0
+    refresh_count: int = 1
+
+
+class ValuePool:
+    """A bounded pool of generated values, filled on the first draw, from which values
+    are sampled by reference. Strings are interned, so equal values share storage.
+    """
+
+    __slots__ = ("_rng", "_policy", "_values", "_draws")
+
+    def __init__(self, rng: Random, policy: PoolPolicy) -> None:
+        """Constructor for `ValuePool`.
+
+        Args:
+            rng (Random): The random number generator.
+            policy (PoolPolicy): The size and refresh policy.
+
+        Raises:
+            ValueError: If the policy is invalid.
+        """
+        if policy.size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {policy.size}")
+        if policy.refresh_every < 0 or policy.refresh_count < 0:
+            raise ValueError(f"Invalid pool refresh policy {policy}")
+        self._rng = rng
+        self._policy = policy
+        self._values: list[Any] = []
+        self._draws = 0
+
+    def getstate(self) -> tuple[list[Any], int]:
+        """Returns the values and the draw counter of this pool, see `setstate`.
+
+        Returns:
+            tuple[list[Any], int]: The values and the number of draws since the last
+            refresh.
+        """
+        return list(self._values), self._draws
+
+    def setstate(self, state: tuple[list[Any], int]) -> None:
+        """Restores the values and the draw counter of this pool.
+
+        Args:
+            state (tuple[list[Any], int]): A state returned by `getstate`.
+        """
+        values, self._draws = state
+        self._values = [self._intern(x) for x in values]
+
+    @staticmethod
+    def _intern(value: Any) -> Any:
+        return sys.intern(value) if type(value) is str else value
+
+    def draw(self, fill: Callable[..., Any], *args: Any) -> Any:
+        """Samples a value of the pool.
+
+        Args:
+            fill (Callable[..., Any]): Generates a fresh value, called with `args` to
+            fill and refresh the pool.
+
+        Returns:
+            Any: The sampled value.
+        """
+        values, policy, rng = self._values, self._policy, self._rng
+        if not values:
+            values.extend(self._intern(fill(*args)) for _ in range(policy.size))
+
+        if policy.refresh_every > 0:
+            self._draws += 1
+            if self._draws >= policy.refresh_every:
+                self._draws = 0
+                for _ in range(min(policy.refresh_count, policy.size)):
+                    values[rng.randrange(policy.size)] = self._intern(fill(*args))
+
+        return values[rng.randrange(policy.size)]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from random import Random
+
+
+class Charset:
+    """A set of single-byte (latin-1) characters, with a precomputed translation table
+    that maps random bytes to uniformly distributed characters of the set.
+    """
+
+    __slots__ = ("chars", "table", "delete")
+
+    def __init__(self, chars: str) -> None:
+        """Constructor for `Charset`.
+
+        Args:
+            chars (str): The characters, duplicates are ignored.
+
+        Raises:
+            ValueError: If `chars` is empty or contains characters outside latin-1.
+        """
+        chars = "".join(dict.fromkeys(chars))
+        try:
+            encoded = chars.encode("latin-1")
+        except UnicodeEncodeError:
+            raise ValueError("Charsets can only contain latin-1 characters")
+        if len(encoded) == 0:
+            raise ValueError("Charsets cannot be empty")
+
+        # Byte values above the largest multiple of the charset size are deleted, so
+        # that the surviving ones map uniformly onto the characters.
+        k = len(encoded)
+        limit = 256 - 256 % k
+        self.chars = chars
+        self.table = bytes(encoded[i % k] for i in range(256))
+        self.delete = bytes(range(limit, 256))
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def get(cls, chars: str) -> Charset:
+        """Returns the (cached) charset of a string of characters.
+
+        Args:
+            chars (str): The characters.
+
+        Returns:
+            Charset: The charset.
+        """
+        return cls(chars)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"Charset({self.chars!r})"
+
+
+class StringEngine:
+    """Generates random strings from buffers of random characters, which are filled in
+    blocks by translating random bytes through the translation table of a `Charset`.
+    Blocks start small and double at every refill, so that generators drawing only a
+    few strings stay cheap.
+    """
+
+    def __init__(
+        self, rng: Random, block_size: int = 4096, initial_block_size: int = 64
+    ) -> None:
+        """Constructor for `StringEngine`.
+
+        Args:
+            rng (Random): The random number generator.
+            block_size (int, optional): Maximum number of random bytes drawn at once.
+            Defaults to 4096.
+            initial_block_size (int, optional): Number of random bytes drawn by the
+            first refill of every buffer. Defaults to 64.
+        """
+        self._rng = rng
+        self._block_size = block_size
+        self._initial_block_size = min(initial_block_size, block_size)
+        # charset characters -> [buffer of random characters, position of the first
+        # unused one, size of the next block]. Keyed by characters, as equal charsets
+        # may be different objects once evicted from the cache of `Charset.get`.
+        self._buffers: dict[str, list] = {}
+
+    def getstate(self) -> dict[str, tuple[str, int]]:
+        """Returns the unused characters and the next block size of every buffer, see
+        `setstate`.
+
+        Returns:
+            dict[str, tuple[str, int]]: The unused characters and the next block size,
+            by charset characters.
+        """
+        return {k: (buf[0][buf[1] :], buf[2]) for k, buf in self._buffers.items()}
+
+    def setstate(self, state: dict[str, tuple[str, int]]) -> None:
+        """Restores the buffers of this engine.
+
+        Args:
+            state (dict[str, tuple[str, int]]): A state returned by `getstate`.
+        """
+        self._buffers = {k: [v, 0, b] for k, (v, b) in state.items()}
+
+    def _randbytes(self, n: int) -> bytes:
+        randbytes = getattr(self._rng, "randbytes", None)
+        if randbytes is not None:
+            return randbytes(n)
+        return self._rng.getrandbits(n * 8).to_bytes(n, "little")
+
+    def _refill(self, charset: Charset, n: int) -> list:
+        buf = self._buffers.get(charset.chars)
+        if buf is None:
+            chars, size = "", self._initial_block_size
+        else:
+            chars, size = buf[0][buf[1] :], buf[2]
+        while len(chars) < n:
+            block = self._randbytes(max(size, n))
+            chars += block.translate(charset.table, charset.delete).decode("latin-1")
+            size = min(size * 2, self._block_size)
+        buf = self._buffers[charset.chars] = [chars, 0, size]
+        return buf
+
+    def string(self, n: int, charset: Charset) -> str:
+        """Generates a random string.
+
+        Args:
+            n (int): The length of the string.
+            charset (Charset): The characters to choose from.
+
+        Returns:
+            str: The random string.
+        """
+        buf = self._buffers.get(charset.chars)
+        if buf is None or buf[1] + n > len(buf[0]):
+            buf = self._refill(charset, n)
+        chars, pos = buf[0], buf[1]
+        buf[1] = pos + n
+        return chars[pos : pos + n]
@@ -37,6 +37,8 @@ setup(
     # Requirements
     python_requires=">=3.9",
     install_requires=requirements,
+    extras_require={"numpy": ["numpy"], "yaml": ["pyyaml"]},
+    entry_points={"console_scripts": ["rsg=rsg.cli:main"]},
     # Tests
     test_suite="tests",
     test_requires=requirements_dev,
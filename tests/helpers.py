@@ -0,0 +1,19 @@
+"""Test helpers shared by several test modules."""
+
+from rsg.core import RsgInt, RsgList, RsgTuple
+
+
+class RsgIntList(RsgInt, RsgList):
+    pass
+
+
+class RsgIntSeq(RsgInt, RsgList, RsgTuple):
+    pass
+
+
+def count_nodes(data):
+    if isinstance(data, dict):
+        data = list(data.values())
+    if isinstance(data, (list, tuple)):
+        return 1 + sum(count_nodes(x) for x in data)
+    return 1
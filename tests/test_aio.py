@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from rsg.core import RsgInt, RsgList, generator
+from rsg.profiling import Profiler
+from rsg.utils.aio import AsyncLimiter
+from rsg.utils.pool import PoolPolicy
+
+
+class RsgAsync(RsgList):
+    running = 0
+    max_running = 0
+
+    @generator("fetch")
+    async def _fetch(self, delay: float = 0.01):
+        cls = RsgAsync
+        cls.running += 1
+        cls.max_running = max(cls.max_running, cls.running)
+        await asyncio.sleep(delay)
+        cls.running -= 1
+        return "fetched"
+
+
+def check(data):
+    if isinstance(data, list):
+        return all(check(x) for x in data)
+    return data == "fetched"
+
+
+class TestAsync:
+    def setup_method(self):
+        RsgAsync.running = RsgAsync.max_running = 0
+
+    def test_agenerate(self):
+        rsg = RsgAsync(min_depth=2, max_depth=3, min_breadth=2, max_breadth=4)
+        for _ in range(5):
+            assert check(asyncio.run(rsg.agenerate()))
+
+    def test_concurrent_siblings(self):
+        rsg = RsgAsync(min_depth=1, max_depth=1, min_breadth=8, max_breadth=8)
+        data = asyncio.run(rsg.agenerate())
+        assert data == ["fetched"] * 8
+        assert RsgAsync.max_running == 8
+
+    def test_max_concurrency(self):
+        rsg = RsgAsync(
+            min_depth=1, max_depth=1, min_breadth=8, max_breadth=8, max_concurrency=2
+        )
+        assert asyncio.run(rsg.agenerate()) == ["fetched"] * 8
+        assert RsgAsync.max_running == 2
+
+    def test_async_for(self):
+        async def _collect():
+            res = []
+            async for x in RsgAsync(max_depth=2, max_breadth=3):
+                res.append(x)
+                if len(res) == 5:
+                    return res
+
+        assert all(check(x) for x in asyncio.run(_collect()))
+
+    def test_sync_generate(self):
+        rsg = RsgAsync(min_depth=0, max_depth=0)
+        with pytest.raises(TypeError):
+            next(rsg)
+
+    @pytest.mark.parametrize(
+        ["kwargs"],
+        [
+            [{"max_bytes": 1000}],
+            [{"leaf_pool": PoolPolicy()}],
+            [{"share_chance": 0.5}],
+            [{"hook": Profiler()}],
+            [{"lazy_children": True}],
+        ],
+    )
+    def test_unsupported(self, kwargs):
+        with pytest.raises(ValueError):
+            RsgAsync(max_depth=2, max_breadth=3, **kwargs)
+
+    def test_sync_rsg(self):
+        rsg = RsgInt(seed=42)
+        assert asyncio.run(rsg.agenerate()) == RsgInt(seed=42).generate()
+
+
+class TestAsyncLimiter:
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            AsyncLimiter(0)
+
+    def test_semaphore(self):
+        limiter = AsyncLimiter(3)
+
+        async def _get():
+            return limiter.semaphore()
+
+        assert limiter.limit == 3
+        assert asyncio.run(_get()) is not asyncio.run(_get())
@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from rsg.cache import CorpusCache, corpus_key
+from rsg.core import RsgBase, RsgDict, RsgInt, generator
+from rsg.profiling import Profiler
+
+
+class TestCorpusCache:
+    def test_get(self, tmp_path):
+        cache = CorpusCache(tmp_path)
+        kwargs = {"min_depth": 1, "max_depth": 3, "max_breadth": 4}
+        rsg = RsgBase(seed=42, **kwargs)
+        next(rsg)
+        cold = cache.get(rsg, 50)
+        assert len(list(tmp_path.iterdir())) == 1
+        warm = cache.get(RsgBase(seed=42, **kwargs), 50)
+        assert isinstance(warm.kinds, memoryview)
+        ref = RsgBase(seed=42, **kwargs).generate_columnar(50)
+        assert list(cold) == list(warm) == list(ref)
+
+    def test_key(self):
+        class MyRsg(RsgInt):
+            @generator("zero")
+            def generate_zero(self):
+                return 0
+
+        rsg = MyRsg(seed=1)
+        assert corpus_key(rsg, 10) == corpus_key(MyRsg(seed=1), 10)
+        assert corpus_key(rsg, 10) != corpus_key(rsg, 11)
+        assert corpus_key(rsg, 10) != corpus_key(MyRsg(seed=2), 10)
+        assert corpus_key(rsg, 10) != corpus_key(MyRsg(seed=1, max_int_val=5), 10)
+        with pytest.raises(ValueError):
+            corpus_key(MyRsg(seed=1, hook=Profiler()), 10)
+
+    def test_key_code(self):
+        def _make(value):
+            class MyRsg(RsgInt):
+                @generator("const")
+                def generate_const(self):
+                    return value * 2
+
+            return MyRsg
+
+        class MyOtherRsg(RsgInt):
+            @generator("const")
+            def generate_const(self):
+                return 1
+
+        MyOtherRsg.__qualname__ = _make(0).__qualname__
+        assert corpus_key(_make(0)(seed=1), 10) != corpus_key(MyOtherRsg(seed=1), 10)
+
+    def test_key_helpers(self):
+        class MyRsg(RsgDict, RsgInt):
+            pass
+
+        class MyOtherRsg(RsgDict, RsgInt):
+            def _generate_key(self, *args):
+                return "key"
+
+        MyOtherRsg.__qualname__ = MyRsg.__qualname__
+        assert corpus_key(MyRsg(seed=1), 10) != corpus_key(MyOtherRsg(seed=1), 10)
+
+    def test_key_processes(self):
+        code = (
+            "from rsg.cache import corpus_key; from rsg.core import RsgBase;"
+            "print(corpus_key(RsgBase(seed=1, max_depth=3), 10))"
+        )
+        env = dict(os.environ, PYTHONHASHSEED="123")
+        out = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, check=True
+        )
+        assert out.stdout.decode().strip() == corpus_key(
+            RsgBase(seed=1, max_depth=3), 10
+        )
+
+    def test_eviction(self, tmp_path):
+        cache = CorpusCache(tmp_path, max_bytes=1)
+        for seed in range(3):
+            rsg = RsgBase(seed=seed, max_depth=2, max_breadth=3)
+            assert len(cache.get(rsg, 10)) == 10
+            assert list(tmp_path.iterdir()) == [cache.path(rsg, 10)]
+        cache.clear()
+        assert list(tmp_path.iterdir()) == []
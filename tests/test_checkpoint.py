@@ -0,0 +1,63 @@
+import pickle
+
+import pytest
+from rsg.core import RsgBase, RsgDict, RsgInt, RsgTuple
+from rsg.utils.blocks import np
+from rsg.utils.pool import PoolPolicy
+
+
+class RsgIntTuple(RsgInt, RsgTuple):
+    pass
+
+
+def _interrupted(factory, n, crash_at, checkpoint_every):
+    checkpoints = []
+    out = []
+    rsg = factory()
+    for x in rsg.generate_stream(n, checkpoint_every, checkpoints.append):
+        out.append(x)
+        if len(out) == crash_at:
+            break
+
+    state = pickle.loads(pickle.dumps(checkpoints[-1]))
+    out = out[: state["index"]]
+    out.extend(type(rsg).resume(state).generate_stream(n))
+    return out
+
+
+class TestCheckpoint:
+    @pytest.mark.parametrize(
+        ["factory"],
+        [
+            [lambda: RsgBase(seed=42, min_depth=1, max_depth=3, max_breadth=4)],
+            [lambda: RsgBase(max_depth=3, max_breadth=4)],
+            [lambda: RsgDict(seed=1, max_depth=2, leaf_pool=PoolPolicy(4, 3, 2))],
+            [
+                lambda: RsgIntTuple(
+                    seed=1, min_depth=4, max_depth=4, max_breadth=3, share_chance=0.5
+                )
+            ],
+        ],
+    )
+    def test_resume(self, factory):
+        rsg = factory()
+        state = rsg.getstate()
+        ref = list(rsg.generate_stream(100))
+        assert list(type(rsg).resume(state).generate_stream(100)) == ref
+        assert _interrupted(lambda: type(rsg).resume(state), 100, 77, 10) == ref
+
+    @pytest.mark.skipif(np is None, reason="numpy is not installed")
+    def test_resume_numpy(self):
+        rsg = RsgBase(seed=42, max_depth=2, max_breadth=4, backend="numpy")
+        state = rsg.getstate()
+        ref = list(rsg.generate_stream(100))
+        assert _interrupted(lambda: RsgBase.resume(state), 100, 55, 20) == ref
+
+    def test_wrong_class(self):
+        with pytest.raises(ValueError):
+            RsgInt.resume(RsgBase().getstate())
+
+    @pytest.mark.parametrize(["checkpoint_every"], [[0], [-1]])
+    def test_invalid_checkpoint_every(self, checkpoint_every):
+        with pytest.raises(ValueError):
+            RsgBase().generate_stream(10, checkpoint_every=checkpoint_every)
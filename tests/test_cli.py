@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from rsg.cli import load_class, main, parse_params
+from rsg.core import RsgBase, RsgInt
+from rsg.parallel import generate_parallel
+
+
+class TestCli:
+    def _read(self, directory, pattern="*.jsonl"):
+        paths = sorted(directory.glob(pattern))
+        return paths, [json.loads(x) for p in paths for x in p.read_text().splitlines()]
+
+    def test_jsonl(self, tmp_path, capsys):
+        argv = ["rsg.core:RsgBase", "-n", "250", "--seed", "42", "-o", str(tmp_path)]
+        argv += ["--shard-size", "100", "--chunksize", "30", "-p", "max_depth=2"]
+        assert main(argv) == 0
+        paths, data = self._read(tmp_path)
+        assert [x.name for x in paths] == [f"rsg-0000{i}.jsonl" for i in range(3)]
+
+        rsg = RsgBase(seed=42, max_depth=2)
+        ref = list(generate_parallel(rsg, 250, workers=2, chunksize=30))
+        assert data == json.loads(json.dumps(ref, default=repr))
+        assert "250 structures" in capsys.readouterr().err
+
+    def test_workers(self, tmp_path):
+        argv = ["rsg.core.RsgInt", "-n", "50", "--seed", "1", "--chunksize", "7", "-q"]
+        main(argv + ["-o", str(tmp_path / "a")])
+        main(argv + ["-o", str(tmp_path / "b"), "--workers", "2"])
+        assert self._read(tmp_path / "a")[1] == self._read(tmp_path / "b")[1]
+
+    def test_stats(self, tmp_path):
+        argv = ["rsg.core:RsgBase", "-n", "40", "--seed", "1", "--chunksize", "7"]
+        argv += ["-q", "-o", str(tmp_path), "-p", "max_depth=2"]
+        main(argv + ["--stats", str(tmp_path / "a.json")])
+        main(argv + ["--stats", str(tmp_path / "b.json"), "--workers", "2"])
+        a = json.loads((tmp_path / "a.json").read_text())
+        b = json.loads((tmp_path / "b.json").read_text())
+        assert a["structures"] == 40
+        assert len(a.pop("str_samples")) == len(b.pop("str_samples"))
+        assert a == b
+
+    def test_yaml(self, tmp_path):
+        yaml = pytest.importorskip("yaml")
+        argv = ["rsg.core:RsgBase", "-n", "20", "-o", str(tmp_path), "--format", "yaml"]
+        main(argv + ["-q", "-p", "max_depth=3", "max_breadth=3"])
+        (path,) = tmp_path.glob("*.yaml")
+        assert len(list(yaml.safe_load_all(path.read_text()))) == 20
+
+    @pytest.mark.parametrize(
+        ["args"],
+        [
+            [["-n", "0"]],
+            [["--shard-size", "0"]],
+            [["--workers", "-1"]],
+            [["--chunksize", "x"]],
+            [["-p", "seed=1"]],
+            [["-p", "max_depth=x"]],
+            [["-p", "share_cache_size=0"]],
+        ],
+    )
+    def test_invalid(self, tmp_path, capsys, args):
+        with pytest.raises(SystemExit) as e:
+            main(["rsg.core:RsgBase", "-q", "-o", str(tmp_path)] + args)
+        assert e.value.code == 2
+        assert "error:" in capsys.readouterr().err
+        assert list(tmp_path.iterdir()) == []
+
+    def test_load_class(self):
+        assert load_class("rsg.core:RsgInt") is RsgInt
+        assert load_class("rsg.core.RsgBase") is RsgBase
+        with pytest.raises(ValueError):
+            load_class("rsg.core:generator")
+
+    def test_parse_params(self):
+        params = parse_params(["max_depth=3", "str_charset=abc", "x=[1, 2]"])
+        assert params == {"max_depth": 3, "str_charset": "abc", "x": [1, 2]}
+        with pytest.raises(ValueError):
+            parse_params(["max_depth"])
@@ -0,0 +1,58 @@
+import pytest
+from rsg.columnar import Columnar, NodeKind
+from helpers import RsgIntSeq
+from rsg.core import RsgBase, RsgInt, RsgList, generator
+
+
+class TestColumnar:
+    def test_same_as_generate(self):
+        kwargs = {"min_depth": 1, "max_depth": 4, "min_breadth": 1, "max_breadth": 3}
+        rsg = RsgIntSeq(seed=42, **kwargs)
+        ref = RsgIntSeq(seed=42, **kwargs)
+        data = rsg.generate_columnar(20)
+        assert len(data) == 20
+        assert list(data) == [next(ref) for _ in range(20)]
+
+    def test_dict_same_as_generate(self):
+        kwargs = {"min_depth": 1, "max_depth": 4, "max_breadth": 4}
+        kwargs.update(min_key_len=1, max_key_len=2)
+        rsg, ref = RsgBase(seed=42, **kwargs), RsgBase(seed=42, **kwargs)
+        assert list(rsg.generate_columnar(30)) == [next(ref) for _ in range(30)]
+
+    def test_columns(self):
+        rsg = RsgBase(seed=42, min_depth=1, max_depth=4, max_breadth=3)
+        data = rsg.generate_columnar(50)
+        n = len(data.kinds)
+        assert len(data.sizes) == len(data.offsets) == n
+        assert data[:3] == [data[0], data[1], data[2]]
+        n_keys = 0
+        for node in range(n):
+            children = list(data.children(node))
+            assert data.sizes[node] == 1 + sum(data.sizes[x] for x in children)
+            if data.kinds[node] == NodeKind.DICT:
+                n_keys += len(children)
+            elif data.kinds[node] <= NodeKind.TUPLE:
+                assert data.offsets[node] == len(children)
+        assert len(data.keys) == n_keys
+        assert sum(data.sizes[x] for x in data.roots) == n
+        assert data.nbytes > 0
+
+    def test_objects(self):
+        class MyRsg(RsgList):
+            @generator("misc")
+            def generate_misc(self):
+                return self.rng.choice([True, None, 2**70, "€"])
+
+        data = Columnar()
+        rsg = MyRsg(seed=42, min_depth=1, max_depth=3, max_breadth=4)
+        for _ in range(10):
+            events = list(rsg.events())
+            data.extend(events)
+        for x in data:
+            assert isinstance(x, list)
+
+    @pytest.mark.parametrize(["index"], [[0], [-1]])
+    def test_getitem(self, index):
+        data = RsgInt(seed=42).generate_columnar(5)
+        assert isinstance(data[index], int)
+        assert data.kinds[data.roots[index]] == NodeKind.INT
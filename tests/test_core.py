@@ -1,4 +1,7 @@
+from random import Random
+
 import pytest
+from helpers import count_nodes
 from rsg.core import (
     Rsg,
     RsgBase,
@@ -11,6 +14,7 @@ from rsg.core import (
     generator,
 )
 from rsg.utils.helpers import make_attrs
+from rsg.utils.pool import PoolPolicy
 
 
 class TestRsg:
@@ -112,6 +116,258 @@ class TestRsg:
             rsg = MyRsg(min_depth=2, max_depth=4, min_breadth=2, max_breadth=5)
             next(rsg)
 
+        # Missing parameters are reported at construction, even when the generator
+        # method is only available in deeper levels
+        with pytest.raises(AttributeError):
+            MyRsg(min_depth=2, max_depth=4, min_breadth=2, max_breadth=5)
+
+    def test_call_generator(self):
+        rsg = RsgList(seed=42, min_depth=1, max_depth=1, min_breadth=3, max_breadth=3)
+        assert RsgList._generate_list(rsg) == [[], [], []]
+        assert RsgInt._generate_int(RsgInt(max_int_val=0)) == 0
+
+    def test_generate_many(self):
+        class MyRsg(Rsg):
+            @generator("a")
+            def generate_a(self):
+                return "A"
+
+            @generator("b")
+            def generate_b(self):
+                return "B"
+
+        rsg = MyRsg(a_chance=0.0, b_chance=1.0)
+        assert rsg.generate_many(0) == []
+        assert rsg.generate_many(10) == ["B"] * 10
+
+        rsg = MyRsg()
+        res = rsg.generate_many(100)
+        assert len(res) == 100
+        assert set(res) <= {"A", "B"}
+
+    def test_seed(self):
+        kwargs = {"min_depth": 1, "max_depth": 3, "max_breadth": 4}
+        a = RsgBase(seed=42, **kwargs).generate_many(20)
+        b = RsgBase(seed=42, **kwargs).generate_many(20)
+        c = RsgBase(seed=43, **kwargs).generate_many(20)
+        assert a == b
+        assert a != c
+
+    def test_rng(self):
+        rsg = RsgBase(rng=Random(42), max_depth=3, max_breadth=4)
+        assert rsg.child.rng is rsg.rng
+        assert rsg.generate_many(20) == RsgBase(
+            rng=Random(42), max_depth=3, max_breadth=4
+        ).generate_many(20)
+
+    def test_split(self):
+        rsg = RsgBase(seed=42, max_depth=3, max_breadth=4)
+        streams = rsg.split(3)
+        data = [x.generate_many(20) for x in streams]
+        assert data[0] != data[1] != data[2]
+        assert rsg.substream(2).generate_many(20) == data[2]
+        assert RsgBase(rng=Random(42)).split(2)[1].seed is not None
+
+    @pytest.mark.parametrize(["max_nodes"], [[1], [10], [100]])
+    def test_max_nodes(self, max_nodes):
+        rsg = RsgBase(
+            seed=42, min_depth=3, max_depth=6, max_breadth=10, max_nodes=max_nodes
+        )
+        for x in rsg.generate_many(10):
+            assert count_nodes(x) <= max_nodes
+        for _ in range(10):
+            assert count_nodes(next(rsg)) <= max_nodes
+
+    def test_max_nodes_forces_leaves(self):
+        rsg = RsgBase(seed=42, min_depth=3, max_depth=6, max_breadth=10, max_nodes=1)
+        assert rsg.child.child._budget is rsg._budget
+        assert all(isinstance(x, (int, float, str)) for x in rsg.generate_many(10))
+
+    def test_max_bytes(self):
+        kwargs = {"min_depth": 3, "max_depth": 4, "min_breadth": 5, "max_breadth": 5}
+        unbounded = RsgList(seed=42, **kwargs)
+        rsg = RsgList(seed=42, max_bytes=1, **kwargs)
+        for _ in range(10):
+            assert count_nodes(next(rsg)) < count_nodes(next(unbounded))
+
+    def test_budget_lazy(self):
+        with pytest.raises(ValueError):
+            RsgList(max_nodes=10, lazy_children=True)
+
+    def test_level_table(self):
+        a = RsgBase(seed=1, min_depth=1, max_depth=3, max_breadth=4)
+        b = RsgBase(seed=2, min_depth=1, max_depth=3, max_breadth=4)
+        assert a._levels is b._levels
+        assert len(a._levels) == 4
+        assert a._levels is not RsgBase(max_depth=4)._levels
+
+        child = a.child.child
+        assert (child.min_depth, child.max_depth) == (0, 1)
+        assert child._levels is a._levels
+        assert child.rng is a.rng
+        assert child.child.child.child.max_depth == 0
+
+    def test_level_table_unhashable(self):
+        class MyRsg(Rsg):
+            @generator("item")
+            def generate_item(self, items):
+                return self.rng.choice(items)
+
+        a = MyRsg(items=[1, 2])
+        assert a._levels is not MyRsg(items=[1, 2])._levels
+        assert next(a) in [1, 2]
+
+    def test_level_table_attributes(self):
+        class MyRsg(Rsg):
+            def __init__(self, base, **kwargs):
+                self.base = base
+                super().__init__(**kwargs)
+
+            @generator("base")
+            def generate_base(self, base):
+                return base
+
+        assert next(MyRsg(2)) == 2
+        assert next(MyRsg(3)) == 3
+        assert MyRsg(3)._levels is MyRsg(3)._levels
+
+    def test_leaf_pool(self):
+        kwargs = {"min_depth": 1, "max_depth": 3, "max_breadth": 5}
+        rsg = RsgBase(seed=42, leaf_pool=PoolPolicy(size=8), **kwargs)
+        leaves, keys = set(), set()
+        stack = rsg.generate_many(100)
+        while stack:
+            x = stack.pop()
+            if isinstance(x, dict):
+                keys.update(x)
+                stack.extend(x.values())
+            elif isinstance(x, (list, tuple)):
+                stack.extend(x)
+            else:
+                leaves.add(id(x))
+        assert 0 < len(leaves) <= 3 * 8
+        assert 0 < len(keys) <= 8
+        assert rsg.child.child._pools is rsg._pools
+        assert rsg.substream(0).leaf_pool == rsg.leaf_pool
+        assert rsg._levels is not RsgBase(**kwargs)._levels
+
+    def test_structural_sharing(self):
+        kwargs = {"min_depth": 6, "max_depth": 6, "min_breadth": 4, "max_breadth": 4}
+        rsg = RsgTuple(seed=42, share_chance=0.9, share_cache_size=2, **kwargs)
+        data = next(rsg)
+        unique, stack = set(), [data]
+        while stack:
+            x = stack.pop()
+            if id(x) not in unique:
+                unique.add(id(x))
+                stack.extend(x if isinstance(x, tuple) else [])
+        assert len(unique) < count_nodes(data) == (4**7 - 1) // 3
+        assert rsg.child._shared is not rsg.child.child._shared
+        assert rsg.substream(0).share_chance == 0.9
+
+    def test_structural_sharing_immutable(self):
+        class MyRsg(RsgTuple):
+            @generator("frozen_list", default_chance=0.5)
+            def generate_frozen_list(self, children):
+                return (list(children),)
+
+        kwargs = {"min_depth": 4, "max_depth": 4, "min_breadth": 3, "max_breadth": 3}
+        for cls in [RsgList, RsgDict, MyRsg]:
+            rsg = cls(seed=42, share_chance=0.9, **kwargs)
+            data = [next(rsg) for _ in range(5)]
+            mutable, stack = [], list(data)
+            while stack:
+                x = stack.pop()
+                if isinstance(x, (list, dict)):
+                    mutable.append(x)
+                if isinstance(x, dict):
+                    x = list(x.values())
+                if isinstance(x, (list, tuple)):
+                    stack.extend(x)
+            assert len(mutable) == len(set(map(id, mutable)))
+
+    def test_structural_sharing_events(self):
+        rsg = RsgTuple(share_chance=0.5)
+        with pytest.raises(ValueError):
+            rsg.events()
+        with pytest.raises(ValueError):
+            rsg.generate_columnar(10)
+
+    @pytest.mark.parametrize(
+        ["kwargs"],
+        [
+            [{"lazy_children": True}],
+            [{"max_nodes": 10}],
+            [{"share_cache_size": 0}],
+        ],
+    )
+    def test_structural_sharing_invalid(self, kwargs):
+        with pytest.raises(ValueError):
+            RsgTuple(share_chance=0.5, **kwargs)
+
+
+class TestRsgMeta:
+    def test_registry(self):
+        assert set(RsgBase._generators_map) == {
+            "int",
+            "float",
+            "str",
+            "dict",
+            "list",
+            "tuple",
+        }
+        assert RsgBase._generators == frozenset(RsgBase._generators_map.values())
+        assert Rsg._generators == frozenset()
+        with pytest.raises(TypeError):
+            RsgBase._generators_map["foo"] = None
+
+    def test_override(self):
+        class A(Rsg):
+            @generator("a")
+            def generate_a(self):
+                return "a"
+
+            @generator("x")
+            def generate_x(self):
+                return "x"
+
+        class B(A):
+            @generator("b")
+            def generate_a(self):
+                return "b"
+
+        class C(A):
+            generate_x = None
+
+        class D(C, B):
+            pass
+
+        assert set(A._generators_map) == {"a", "x"}
+        assert set(B._generators_map) == {"b", "x"}
+        assert set(C._generators_map) == {"a"}
+        assert set(D._generators_map) == {"b"}
+        assert set(next(D()) for _ in range(10)) == {"b"}
+
+    def test_shadowed_by_unrelated_base(self):
+        class A(Rsg):
+            @generator("a")
+            def generate_a(self):
+                return "a"
+
+            @generator("x")
+            def generate_x(self):
+                return "x"
+
+        class B(Rsg):
+            generate_x = None
+
+        class C(B, A):
+            pass
+
+        assert C.generate_x is None
+        assert set(C._generators_map) == {"a"}
+        assert set(next(C()) for _ in range(10)) == {"a"}
+
 
 class TestRsgList:
     def test_rsg_list(self):
@@ -126,6 +382,24 @@ class TestRsgDict:
         for _ in range(10):
             assert isinstance(next(rsg), dict)
 
+    def test_rsg_dict_keys(self):
+        rsg = RsgDict(max_depth=1, min_breadth=4, max_breadth=4)
+        for _ in range(10):
+            assert all(x.isidentifier() for x in next(rsg))
+
+        rsg = RsgDict(
+            max_depth=1,
+            min_breadth=4,
+            max_breadth=4,
+            min_key_len=3,
+            max_key_len=3,
+            key_charset="01",
+            key_head_charset="k",
+        )
+        for _ in range(10):
+            for x in next(rsg):
+                assert x[0] == "k" and set(x[1:]) <= {"0", "1"} and len(x) == 3
+
 
 class TestRsgTuple:
     def test_rsg_tuple(self):
@@ -154,6 +428,13 @@ class TestRsgStr:
         for _ in range(10):
             assert isinstance(next(rsg), str)
 
+    def test_rsg_str_charset(self):
+        rsg = RsgStr(min_str_len=2, max_str_len=5, str_charset="xy")
+        for _ in range(10):
+            x = next(rsg)
+            assert 2 <= len(x) <= 5
+            assert set(x) <= {"x", "y"}
+
 
 class TestRsgBase:
     def test_rsg_base(self):
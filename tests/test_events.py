@@ -0,0 +1,118 @@
+import io
+import json
+
+import pytest
+from helpers import RsgIntSeq, count_nodes
+from rsg.core import RsgBase, RsgInt, generator
+from rsg.events import Event, EventType, dump_json
+from rsg.utils.pool import PoolPolicy
+
+
+def build(events):
+    stack = [[]]
+    keys = [None]
+    for event in events:
+        if event.type in (EventType.START_LIST, EventType.START_TUPLE):
+            stack.append([])
+            keys.append(None)
+        elif event.type is EventType.START_DICT:
+            stack.append({})
+            keys.append(None)
+        elif event.type is EventType.KEY:
+            keys[-1] = event.value
+        else:
+            if event.type is EventType.LEAF:
+                value = event.value
+            else:
+                value = stack.pop()
+                keys.pop()
+                if event.type is EventType.END_TUPLE:
+                    value = tuple(value)
+            if isinstance(stack[-1], dict):
+                stack[-1][keys[-1]] = value
+            else:
+                stack[-1].append(value)
+    return stack[0][0]
+
+
+class TestEvents:
+    def test_same_as_generate(self):
+        kwargs = {"min_depth": 1, "max_depth": 4, "min_breadth": 1, "max_breadth": 3}
+        rsg = RsgIntSeq(seed=42, **kwargs)
+        ref = RsgIntSeq(seed=42, **kwargs)
+        for _ in range(10):
+            assert build(rsg.events()) == next(ref)
+
+    @pytest.mark.parametrize(
+        ["kwargs"],
+        [
+            [{}],
+            [{"max_nodes": 30}],
+            [{"leaf_pool": PoolPolicy(size=4)}],
+            # Single character keys, so that dicts have duplicate keys.
+            [{"min_key_len": 1, "max_key_len": 1, "key_head_charset": "ab"}],
+        ],
+    )
+    def test_dict_same_as_generate(self, kwargs):
+        kwargs.update(min_depth=1, max_depth=4, min_breadth=1, max_breadth=4)
+        rsg, ref = RsgBase(seed=42, **kwargs), RsgBase(seed=42, **kwargs)
+        for _ in range(20):
+            assert build(rsg.events()) == next(ref)
+
+    def test_max_nodes_same_as_generate(self):
+        kwargs = {"min_depth": 2, "max_depth": 6, "min_breadth": 2, "max_breadth": 4}
+        rsg = RsgIntSeq(seed=42, max_nodes=20, **kwargs)
+        ref = RsgIntSeq(seed=42, max_nodes=20, **kwargs)
+        for _ in range(10):
+            assert build(rsg.events()) == next(ref)
+
+    def test_max_bytes(self):
+        kwargs = {"min_depth": 2, "max_depth": 6, "min_breadth": 2, "max_breadth": 4}
+        rsg = RsgIntSeq(seed=42, max_bytes=1000, **kwargs)
+        ref = RsgIntSeq(seed=42, **kwargs)
+        for _ in range(10):
+            # Every node takes at least 24 bytes, at most max_breadth children are
+            # pending at every depth when the budget runs out.
+            assert count_nodes(build(rsg.events())) <= 1000 // 24 + 6 * 4
+            assert count_nodes(build(ref.events())) > 1000 // 24 + 6 * 4
+
+    def test_events(self):
+        rsg = RsgBase(seed=42, min_depth=1, max_depth=4, max_breadth=3)
+        for _ in range(10):
+            events = list(rsg.events())
+            assert events[0].type in (
+                EventType.START_LIST,
+                EventType.START_TUPLE,
+                EventType.START_DICT,
+            )
+            keys = [x for x in events if x.type is EventType.KEY]
+            assert all(isinstance(x.value, str) for x in keys)
+            build(events)
+
+    def test_custom_composite(self):
+        class MyRsg(RsgInt):
+            @generator("set")
+            def generate_set(self, children):
+                return set(children)
+
+        rsg = MyRsg(min_depth=1, max_depth=1, min_breadth=1, max_breadth=3)
+        events = list(rsg.events())
+        assert len(events) == 1
+        assert events[0].type is EventType.LEAF
+        assert isinstance(events[0].value, set)
+
+
+class TestDumpJson:
+    def test_dump_json(self):
+        rsg = RsgBase(seed=42, min_depth=1, max_depth=4, max_breadth=3)
+        for _ in range(10):
+            events = list(rsg.events())
+            fp = io.StringIO()
+            dump_json(events, fp)
+            data = build(events)
+            assert json.loads(fp.getvalue()) == json.loads(json.dumps(data))
+
+    def test_dump_json_empty(self):
+        fp = io.StringIO()
+        dump_json([Event(EventType.START_DICT), Event(EventType.END_DICT)], fp)
+        assert fp.getvalue() == "{}"
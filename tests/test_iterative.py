@@ -0,0 +1,50 @@
+import pytest
+from rsg.core import RsgBase, RsgInt, RsgList, generator
+from rsg.profiling import Profiler
+
+
+class TestGenerateIterative:
+    @pytest.mark.parametrize(["seed"], [[0], [1], [42]])
+    def test_same_as_generate(self, seed):
+        kwargs = {"min_depth": 1, "max_depth": 4, "max_breadth": 4}
+        rsg = RsgBase(seed=seed, **kwargs)
+        ref = RsgBase(seed=seed, **kwargs)
+        for _ in range(20):
+            assert rsg.generate_iterative() == ref.generate()
+
+    def test_deep(self):
+        depth = 3000
+        rsg = RsgList(seed=42, min_depth=depth, max_depth=depth, min_breadth=1)
+        data, n = rsg.generate_iterative(), 0
+        while isinstance(data, list) and data:
+            data, n = data[0], n + 1
+        assert n == depth
+
+    def test_custom_composite_and_hook(self):
+        class MyRsg(RsgInt):
+            @generator("sum")
+            def generate_sum(self, children, offset: int = 0):
+                return sum(children) + offset
+
+        profiler = Profiler()
+        kwargs = {"min_depth": 1, "max_depth": 3, "max_breadth": 3, "offset": 1000}
+        rsg = MyRsg(seed=42, **kwargs)
+        ref = MyRsg(seed=42, hook=profiler, **kwargs)
+        assert rsg.generate_iterative() == ref.generate_iterative()
+        assert profiler.report().by_name()["sum"].calls > 0
+
+    def test_error_and_hook(self):
+        class MyRsg(RsgInt):
+            @generator("fail")
+            def generate_fail(self, children):
+                raise RuntimeError("fail")
+
+        profiler = Profiler()
+        rsg = MyRsg(seed=42, min_depth=2, max_depth=2, max_breadth=2, hook=profiler)
+        with pytest.raises(RuntimeError):
+            rsg.generate_iterative()
+        assert profiler._stack == []
+
+    def test_unsupported(self):
+        with pytest.raises(ValueError):
+            RsgList(max_nodes=10).generate_iterative()
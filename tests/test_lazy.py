@@ -0,0 +1,61 @@
+import pytest
+from helpers import RsgIntSeq
+from rsg.core import RsgInt, generator
+from rsg.lazy import LazyChildren, LazyList, LazyTuple
+
+
+class TestLazyList:
+    def test_materialize_on_access(self):
+        lst = LazyList(iter(range(10)))
+        assert lst.materialized == 0
+        assert lst[2] == 2
+        assert lst.materialized == 3
+        assert next(iter(lst)) == 0
+        assert lst.materialized == 3
+        assert lst[-1] == 9
+        assert lst.materialized == 10
+        assert len(lst) == 10
+        assert lst[2:4] == [2, 3]
+        with pytest.raises(IndexError):
+            lst[10]
+
+    def test_len(self):
+        assert len(LazyList(iter(range(5)))) == 5
+        lst = LazyList([1, 2, 3])
+        assert len(lst) == 3
+        assert lst.materialized == 0
+
+    def test_eq(self):
+        assert LazyList(iter(range(3))) == [0, 1, 2]
+        assert LazyTuple(iter(range(3))) == (0, 1, 2)
+        assert LazyTuple(iter(range(3))) != [0, 1, 2]
+        assert repr(LazyList(iter(range(2)))) == "LazyList([0, 1])"
+
+
+class TestLazyChildren:
+    def test_children(self):
+        class MyRsg(RsgInt):
+            @generator("children")
+            def generate_children(self, children):
+                return children
+
+        rsg = MyRsg(
+            min_depth=1, max_depth=1, min_breadth=3, max_breadth=3, lazy_children=True
+        )
+        children = next(rsg)
+        assert isinstance(children, LazyChildren)
+        assert len(children) == 3
+        assert all(isinstance(x, int) for x in children)
+        assert len(children) == 0
+
+    def test_lazy_containers(self):
+        rsg = RsgIntSeq(
+            min_depth=1, max_depth=3, min_breadth=2, max_breadth=4, lazy_children=True
+        )
+        for _ in range(10):
+            x = next(rsg)
+            assert isinstance(x, (LazyList, LazyTuple))
+            assert x.materialized == 0
+            assert 2 <= len(x) <= 4
+            x[0]
+            assert x.materialized == 1
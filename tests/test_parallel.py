@@ -0,0 +1,98 @@
+import pytest
+from rsg.core import RsgBase, RsgInt, RsgList, generator
+from rsg.parallel import _class_spec, _load_class, generate_parallel
+from rsg.profiling import Profiler
+
+# Dynamically composed, so that it is not importable, see `_class_spec`.
+RsgIntList = type("RsgIntList", (RsgInt, RsgList), {})
+
+
+class TestClassSpec:
+    def test_importable(self):
+        assert _class_spec(RsgBase) is RsgBase
+
+    def test_composite(self):
+        spec = _class_spec(RsgIntList)
+        assert spec == ("RsgIntList", (RsgInt, RsgList))
+        cls = _load_class(spec)
+        assert cls.__bases__ == (RsgInt, RsgList)
+        assert set(cls._generators_map) == {"int", "list"}
+
+    def test_local(self):
+        class MyRsg(RsgInt):
+            @generator("a")
+            def generate_a(self):
+                return "a"
+
+        with pytest.raises(TypeError):
+            _class_spec(MyRsg)
+
+
+class TestGenerateParallel:
+    @pytest.mark.parametrize(["n", "chunksize"], [[0, 4], [10, 4], [12, 4]])
+    def test_ordered(self, n, chunksize):
+        rsg = RsgBase(seed=42, max_depth=3, max_breadth=3)
+        res = list(generate_parallel(rsg, n, workers=2, chunksize=chunksize))
+        expected = []
+        for i, start in enumerate(range(0, n, chunksize)):
+            size = min(chunksize, n - start)
+            expected.extend(rsg.substream(i).generate_many(size))
+        assert res == expected
+
+    def test_unordered(self):
+        rsg = RsgIntList(seed=42, max_depth=2, max_breadth=3)
+        res = list(rsg.generate_parallel(20, workers=2, chunksize=3, ordered=False))
+        assert len(res) == 20
+        assert sorted(map(repr, res)) == sorted(
+            map(repr, rsg.generate_parallel(20, workers=1, chunksize=3))
+        )
+
+    def test_hook(self):
+        profiler = Profiler()
+        rsg = RsgBase(seed=42, max_depth=3, max_breadth=3, hook=profiler)
+        res = list(generate_parallel(rsg, 20, workers=2, chunksize=3))
+        calls = sum(x.calls for x in profiler.report().entries if x.depth == 0)
+        assert calls == len(res) == 20
+
+
+class TestGenerateThreaded:
+    @pytest.mark.parametrize(["threads"], [[1], [4]])
+    def test_threaded(self, threads):
+        rsg = RsgBase(seed=42, max_depth=3, max_breadth=3)
+        res = rsg.generate_threaded(50, threads=threads, chunksize=7)
+        assert len(res) == 50
+        assert res == list(generate_parallel(rsg, 50, workers=2, chunksize=7))
+
+    def test_hook(self):
+        profiler = Profiler()
+        rsg = RsgBase(seed=42, max_depth=3, max_breadth=3, hook=profiler)
+        res = rsg.generate_threaded(50, threads=2, chunksize=7)
+        calls = sum(x.calls for x in profiler.report().entries if x.depth == 0)
+        assert calls == len(res) == 50
+
+    def test_shared_instance(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        rsg = RsgBase(min_depth=2, max_depth=6, max_breadth=3)
+        with ThreadPoolExecutor(8) as executor:
+            children = list(executor.map(lambda _: rsg.child.child.child, range(64)))
+        assert all(x is children[0] for x in children)
+
+    def test_shared_generation(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        kwargs = {"min_depth": 1, "max_depth": 3, "max_breadth": 3}
+        rsg, ref = RsgBase(seed=42, **kwargs), RsgBase(seed=42, **kwargs)
+        with ThreadPoolExecutor(8) as executor:
+            res = list(executor.map(lambda _: rsg.generate_many(100), range(16)))
+        assert all(len(x) == 100 for x in res)
+        assert 1 <= rsg._thread_count <= 8
+        assert rsg.generate_many(10) == ref.generate_many(10)
+
+    def test_shared_generation_hook(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        rsg = RsgBase(seed=42, hook=Profiler())
+        with ThreadPoolExecutor(1) as executor:
+            with pytest.raises(ValueError):
+                executor.submit(rsg.generate).result()
@@ -0,0 +1,108 @@
+from itertools import count
+
+import pytest
+from helpers import RsgIntList, count_nodes
+from rsg.core import RsgBase, generator
+from rsg.hooks import GenerationHook
+from rsg.profiling import Profiler
+
+
+class RecordingHook(GenerationHook):
+    def __init__(self):
+        self.calls = []
+
+    def on_enter(self, name, depth):
+        self.calls.append(("enter", name, depth))
+
+    def on_exit(self, name, depth, value):
+        self.calls.append(("exit", name, depth, value))
+
+    def on_error(self, name, depth, error):
+        self.calls.append(("error", name, depth))
+
+
+class TestGenerationHook:
+    def test_hook(self):
+        hook = RecordingHook()
+        rsg = RsgIntList(
+            seed=42, min_depth=1, max_depth=1, min_breadth=2, max_breadth=2, hook=hook
+        )
+        data = next(rsg)
+        assert [x[:3] for x in hook.calls] == [
+            ("enter", "list", 0),
+            ("enter", "int", 1),
+            ("exit", "int", 1),
+            ("enter", "int", 1),
+            ("exit", "int", 1),
+            ("exit", "list", 0),
+        ]
+        assert hook.calls[-1][3] == data
+
+    def test_error(self):
+        class MyRsg(RsgIntList):
+            @generator("fail", default_chance=0.5)
+            def generate_fail(self):
+                raise RuntimeError("fail")
+
+        hook = RecordingHook()
+        rsg = MyRsg(seed=42, min_depth=2, max_depth=2, max_breadth=3, hook=hook)
+        with pytest.raises(RuntimeError):
+            for _ in range(100):
+                next(rsg)
+        assert hook.calls[-3:] == [
+            ("error", "fail", 2),
+            ("error", "list", 1),
+            ("error", "list", 0),
+        ]
+
+
+class TestProfiler:
+    def test_profiler(self):
+        profiler = Profiler(clock=count().__next__)
+        rsg = RsgIntList(
+            seed=42, min_depth=2, max_depth=4, max_breadth=3, hook=profiler
+        )
+        data = rsg.generate_many(20)
+
+        report = profiler.report()
+        roots = [x for x in report.entries if x.depth == 0]
+        assert sum(x.calls for x in roots) == 20
+        assert sum(x.nodes for x in roots) == sum(count_nodes(x) for x in data)
+
+        by_name = report.by_name()
+        assert set(by_name) == {"int", "list"}
+        assert by_name["int"].nodes == by_name["int"].calls
+        for x in report.entries:
+            assert 0 < x.self_time <= x.total_time
+        total = sum(x.total_time for x in roots)
+        assert sum(x.self_time for x in report.entries) == total
+        assert "list" in str(report)
+
+        profiler.reset()
+        assert profiler.report().entries == []
+
+    def test_base(self):
+        profiler = Profiler()
+        rsg = RsgBase(min_depth=1, max_depth=3, max_breadth=4, hook=profiler)
+        assert rsg.child.hook is profiler
+        rsg.generate_many(10)
+        assert sum(x.calls for x in profiler.report().entries) > 10
+
+    def test_error(self):
+        class MyRsg(RsgIntList):
+            @generator("fail", default_chance=0.1)
+            def generate_fail(self):
+                raise RuntimeError("fail")
+
+        profiler = Profiler(clock=count().__next__)
+        rsg = MyRsg(seed=42, min_depth=2, max_depth=3, max_breadth=3, hook=profiler)
+        errors = 0
+        for _ in range(50):
+            try:
+                next(rsg)
+            except RuntimeError:
+                errors += 1
+        assert 0 < errors < 50
+        assert profiler._stack == []
+        for x in profiler.report().entries:
+            assert 0 < x.self_time <= x.total_time
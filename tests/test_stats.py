@@ -0,0 +1,152 @@
+import pytest
+from helpers import RsgIntList, count_nodes
+from rsg.core import RsgBase, RsgInt, RsgList, RsgStr
+from rsg.hooks import GenerationHook
+from rsg.stats import StatsCollector, estimate
+
+
+class TestEstimate:
+    def test_leaf(self):
+        est = estimate(RsgInt(max_depth=5, max_breadth=5))
+        assert est.nodes_mean == 1
+        assert est.nodes_std == 0
+        assert est.nodes_upper_bound(0.99) == 1
+        assert est.nodes_quantile(0.99) == 1
+        assert est.generator_nodes == {"int": 1}
+        assert est.bytes_mean > 0
+
+    def test_deterministic(self):
+        rsg = RsgList(min_depth=2, max_depth=2, min_breadth=2, max_breadth=2)
+        est = estimate(rsg)
+        assert est.nodes_mean == 7
+        assert est.nodes_std == 0
+        assert est.nodes_max == 7
+        assert est.depth_nodes == [1, 2, 4]
+        assert est.nodes_pmf == [0, 0, 0, 0, 0, 0, 0, 1]
+        assert est.nodes_quantile(0.5) == 7
+
+    @pytest.mark.parametrize(["cls"], [[RsgIntList], [RsgBase]])
+    def test_empirical(self, cls):
+        rsg = cls(seed=42, min_depth=1, max_depth=4, min_breadth=1, max_breadth=4)
+        est = estimate(rsg)
+        samples = [count_nodes(x) for x in rsg.generate_many(3000)]
+        mean = sum(samples) / len(samples)
+        std = (sum((x - mean) ** 2 for x in samples) / len(samples)) ** 0.5
+        assert mean == pytest.approx(est.nodes_mean, rel=0.1)
+        assert std == pytest.approx(est.nodes_std, rel=0.15)
+        assert max(samples) <= est.nodes_max
+        assert sum(x > est.nodes_upper_bound(0.99) for x in samples) <= 0.01 * 3000
+        assert est.bytes_upper_bound(0.99) > est.bytes_mean
+        assert sum(est.nodes_pmf) == pytest.approx(1.0)
+        samples.sort()
+        for q in (0.5, 0.9, 0.99):
+            quantile = est.nodes_quantile(q)
+            assert quantile == pytest.approx(samples[int(q * 3000)], rel=0.15)
+            assert quantile < est.nodes_upper_bound(q)
+        assert est.bytes_quantile(0.99) < est.bytes_upper_bound(0.99)
+        assert sum(est.generator_mix.values()) == pytest.approx(1.0)
+
+    def test_max_nodes(self):
+        est = estimate(RsgList(min_depth=3, max_depth=3, max_breadth=5, max_nodes=10))
+        assert est.nodes_max == 10
+        assert len(est.nodes_pmf) == 11
+        assert sum(est.nodes_pmf) == pytest.approx(1.0)
+
+    def test_pure_python(self, monkeypatch):
+        rsg = RsgBase(min_depth=1, max_depth=4, min_breadth=1, max_breadth=4)
+        ref = estimate(rsg).nodes_pmf
+        monkeypatch.setattr("rsg.stats.np", None)
+        assert estimate(rsg).nodes_pmf == pytest.approx(ref, abs=1e-12)
+
+    def test_max_support(self):
+        rsg = RsgList(min_depth=4, max_depth=4, min_breadth=3, max_breadth=5)
+        est = estimate(rsg, max_support=50)
+        assert len(est.nodes_pmf) <= 51
+        assert est.nodes_quantile(0.99) == est.nodes_upper_bound(0.99)
+
+
+class RsgStrList(RsgStr, RsgList):
+    pass
+
+
+class TestStatsCollector:
+    def test_collect(self):
+        stats = StatsCollector()
+        kwargs = {"min_depth": 1, "max_depth": 4, "max_breadth": 4}
+        rsg = RsgIntList(seed=42, hook=stats, **kwargs)
+        data = rsg.generate_many(200)
+        sizes = [count_nodes(x) for x in data]
+        assert stats.structures == 200
+        assert stats.nodes == sum(sizes)
+        assert stats.nodes_max == max(sizes)
+        assert stats.nodes_mean == pytest.approx(sum(sizes) / 200)
+        assert sum(stats.depth_histogram.values()) == stats.nodes
+        assert sum(stats.height_histogram.values()) == 200
+        assert sum(stats.generator_counts.values()) == stats.nodes
+        assert stats.generator_counts["list"] == sum(stats.breadth_histogram.values())
+        assert max(stats.breadth_histogram) <= 4
+
+    def test_iterative(self):
+        kwargs = {"seed": 1, "min_depth": 1, "max_depth": 3, "max_breadth": 3}
+        a, b = StatsCollector(), StatsCollector()
+        for _ in range(50):
+            RsgIntList(hook=a, **kwargs).generate()
+            RsgIntList(hook=b, **kwargs).generate_iterative()
+        assert a.depth_histogram == b.depth_histogram
+        assert a.breadth_histogram == b.breadth_histogram
+
+    def test_events(self):
+        kwargs = {"seed": 1, "min_depth": 1, "max_depth": 3, "max_breadth": 3}
+        a, b = StatsCollector(), StatsCollector()
+        ref, rsg = RsgIntList(hook=a, **kwargs), RsgIntList(hook=b, **kwargs)
+        for _ in range(50):
+            ref.generate()
+            list(rsg.events())
+        assert b.structures == 50 and b._current_nodes == 0
+        assert a.nodes == b.nodes
+        assert a.depth_histogram == b.depth_histogram
+        assert a.height_histogram == b.height_histogram
+
+        events = RsgIntList(hook=b, **kwargs).events()
+        next(events)
+        events.close()
+        assert b.structures == 50 and b._current_nodes == 0
+
+    @pytest.mark.parametrize(["method"], [["generate_parallel"], ["generate_threaded"]])
+    def test_parallel(self, method):
+        kwargs = {"seed": 42, "min_depth": 1, "max_depth": 3, "max_breadth": 3}
+        a, b = StatsCollector(), StatsCollector()
+        res = list(getattr(RsgIntList(hook=a, **kwargs), method)(50, chunksize=7))
+        ref = RsgIntList(hook=b, **kwargs)
+        for i, start in enumerate(range(0, 50, 7)):
+            ref.substream(i).generate_many(min(7, 50 - start))
+        assert a.structures == 50
+        assert a.nodes == b.nodes == sum(count_nodes(x) for x in res)
+        assert a.depth_histogram == b.depth_histogram
+        assert a.generator_counts == b.generator_counts
+
+        rsg = RsgIntList(hook=GenerationHook(), **kwargs)
+        with pytest.raises(ValueError):
+            getattr(rsg, method)(10)
+
+    def test_lazy_children(self):
+        with pytest.raises(ValueError):
+            RsgIntList(hook=StatsCollector(), lazy_children=True)
+
+    def test_strings_and_merge(self):
+        kwargs = {"max_depth": 2, "max_breadth": 5, "max_str_len": 6}
+        a, b = StatsCollector(sample_size=10), StatsCollector(sample_size=10)
+        RsgStrList(seed=1, hook=a, **kwargs).generate_many(100)
+        RsgStrList(seed=2, hook=b, **kwargs).generate_many(100)
+        assert len(a.str_samples) == 10
+        assert set(a.str_len_histogram) <= set(range(4, 7))
+
+        counts = a.generator_counts + b.generator_counts
+        nodes = a.nodes + b.nodes
+        samples = set(a.str_samples) | set(b.str_samples)
+        a.merge(b)
+        assert a.structures == 200
+        assert a.nodes == nodes
+        assert a.generator_counts == counts
+        assert len(a.str_samples) == 10
+        assert set(a.str_samples) <= samples
@@ -0,0 +1,34 @@
+from random import Random
+
+import pytest
+from rsg.utils.alias import AliasTable
+
+
+class TestAliasTable:
+    @pytest.mark.parametrize(
+        ["weights"], [[[1.0]], [[1.0, 3.0]], [[0.0, 2.0, 1.0, 1.0]], [[0.1] * 300]]
+    )
+    def test_distribution(self, weights):
+        items = [f"item_{i}" for i in range(len(weights))]
+        table = AliasTable(items, weights)
+        n = 20000
+        samples = table.sample_many(Random(42), n)
+        samples.append(table.sample(Random(42)))
+        total = sum(weights)
+        for item, w in zip(items, weights):
+            freq = samples.count(item) / len(samples)
+            assert abs(freq - w / total) < 0.02
+            if w == 0:
+                assert item not in samples
+
+    def test_with_items(self):
+        table = AliasTable(["a", "b", "c"], [1.0, 0.0, 2.0])
+        other = table.with_items([1, 2, 3])
+        assert table.sample_many(Random(1), 100) == [
+            {1: "a", 2: "b", 3: "c"}[x] for x in other.sample_many(Random(1), 100)
+        ]
+
+    @pytest.mark.parametrize(["weights"], [[[0.0, 0.0]], [[1.0, -1.0]], [[1.0]]])
+    def test_invalid(self, weights):
+        with pytest.raises(ValueError):
+            AliasTable(["a", "b"], weights)
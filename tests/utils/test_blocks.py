@@ -0,0 +1,64 @@
+import pytest
+from rsg.core import RsgBase, RsgFloat, RsgInt, RsgStr
+from rsg.utils import blocks
+from rsg.utils.blocks import NumpyLeafBackend, make_leaf_backend
+
+
+class TestMakeLeafBackend:
+    def test_random(self):
+        assert make_leaf_backend("random") is None
+        assert make_leaf_backend(None) is None
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            make_leaf_backend("foo")
+
+    @pytest.mark.skipif(blocks.np is not None, reason="numpy is installed")
+    def test_numpy_missing(self):
+        with pytest.raises(ImportError):
+            RsgInt(backend="numpy")
+
+
+class TestNumpyLeafBackend:
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        pytest.importorskip("numpy")
+
+    def test_shared_instance(self):
+        backend = NumpyLeafBackend(seed=42)
+        assert make_leaf_backend(backend) is backend
+
+    def test_leaves(self):
+        backend = NumpyLeafBackend(seed=42, block_size=16)
+        for _ in range(100):
+            x = backend.integers(10)
+            assert isinstance(x, int) and 0 <= x <= 10
+            x = backend.floats(2.0)
+            assert isinstance(x, float) and 0.0 <= x < 2.0
+            x = backend.strings(3, 5, "abc")
+            assert isinstance(x, str) and 3 <= len(x) <= 5 and set(x) <= set("abc")
+
+    @pytest.mark.parametrize(
+        ["cls", "tp", "kwargs"],
+        [
+            [RsgInt, int, {"max_int_val": 5}],
+            [RsgFloat, float, {"max_float_val": 5.0}],
+            [RsgStr, str, {"min_str_len": 2, "max_str_len": 3}],
+        ],
+    )
+    def test_rsg(self, cls, tp, kwargs):
+        rsg = cls(backend="numpy", **kwargs)
+        for _ in range(100):
+            assert isinstance(next(rsg), tp)
+
+    def test_rsg_base(self):
+        rsg = RsgBase(backend="numpy", min_depth=1, max_depth=3, max_breadth=3)
+        assert rsg.child._leaf_backend is rsg._leaf_backend
+        for _ in range(10):
+            assert next(rsg) is not None
+
+    def test_long_strings_block(self):
+        backend = NumpyLeafBackend(seed=42, block_chars=1000)
+        x = backend.strings(0, 400, "abc")
+        assert len(x) <= 400 and set(x) <= set("abc")
+        assert len(backend._blocks[("str", 0, 400, "abc")]) == 1
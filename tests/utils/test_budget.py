@@ -0,0 +1,27 @@
+import pytest
+from rsg.utils.budget import Budget
+
+
+class TestBudget:
+    def test_nodes(self):
+        budget = Budget(max_nodes=5)
+        assert not budget.exhausted
+        assert budget.take(3) == 3
+        assert budget.take(3) == 1
+        assert budget.exhausted
+        assert budget.take(3) == 0
+        budget.reset()
+        assert budget.nodes == 1
+        assert not budget.exhausted
+
+    def test_bytes(self):
+        budget = Budget(max_bytes=100)
+        assert budget.take(1000) == 1000
+        budget.add(b"x" * 100)
+        assert budget.exhausted
+        assert budget.take(1) == 0
+
+    @pytest.mark.parametrize(["kwargs"], [[{"max_nodes": 0}], [{"max_bytes": -1}]])
+    def test_invalid(self, kwargs):
+        with pytest.raises(ValueError):
+            Budget(**kwargs)
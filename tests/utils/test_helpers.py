@@ -1,5 +1,5 @@
 import pytest
-from rsg.utils.helpers import inspect_signature, make_attrs
+from rsg.utils.helpers import derive_seed, inspect_signature, make_attrs
 
 
 class TestMakeAttrs:
@@ -108,3 +108,12 @@ class TestInspectSignature:
         fn = getattr(self, fn)
         res = inspect_signature(fn)
         assert res == expected
+
+
+class TestDeriveSeed:
+    def test_derive_seed(self):
+        assert derive_seed(42, 0) == derive_seed(42, 0)
+        assert derive_seed(42, 0) != derive_seed(42, 1)
+        assert derive_seed(42, 0) != derive_seed(43, 0)
+        assert derive_seed(42, 0, 1) != derive_seed(42, 1, 0)
+        assert 0 <= derive_seed(42, 0) < 2**64
@@ -0,0 +1,33 @@
+from random import Random
+
+import pytest
+from rsg.utils.pool import PoolPolicy, ValuePool
+
+
+class TestValuePool:
+    def test_draw(self):
+        rng = Random(42)
+        pool = ValuePool(rng, PoolPolicy(size=4))
+        fill = lambda: "".join(rng.choices("abc", k=5))  # noqa: E731
+        values = [pool.draw(fill) for _ in range(50)]
+        assert len({id(x) for x in values}) <= 4
+
+    def test_interning(self):
+        pool = ValuePool(Random(42), PoolPolicy(size=16))
+        values = [pool.draw(str, 12345) for _ in range(20)]
+        assert all(x is values[0] for x in values)
+
+    def test_refresh(self):
+        counter = iter(range(1000))
+        pool = ValuePool(Random(42), PoolPolicy(size=4, refresh_every=10))
+        for _ in range(100):
+            pool.draw(next, counter)
+        assert next(counter) == 4 + 100 // 10
+
+    @pytest.mark.parametrize(
+        ["policy"],
+        [[PoolPolicy(size=0)], [PoolPolicy(refresh_every=-1)]],
+    )
+    def test_invalid(self, policy):
+        with pytest.raises(ValueError):
+            ValuePool(Random(), policy)
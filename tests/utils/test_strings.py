@@ -0,0 +1,82 @@
+from collections import Counter
+from random import Random
+
+import pytest
+from rsg.utils.strings import Charset, StringEngine
+
+
+class TestCharset:
+    def test_charset(self):
+        charset = Charset("abca")
+        assert charset.chars == "abc"
+        assert len(charset.table) == 256
+        assert len(charset.delete) == 1
+        assert Charset.get("xyz") is Charset.get("xyz")
+
+    @pytest.mark.parametrize(["chars"], [[""], ["日本"]])
+    def test_invalid(self, chars):
+        with pytest.raises(ValueError):
+            Charset(chars)
+
+
+class TestStringEngine:
+    def test_string(self):
+        engine = StringEngine(Random(42), block_size=16)
+        charset = Charset.get("abc")
+        for n in [0, 1, 5, 100, 3]:
+            x = engine.string(n, charset)
+            assert len(x) == n
+            assert set(x) <= {"a", "b", "c"}
+
+    def test_block_growth(self):
+        engine = StringEngine(Random(42), block_size=256, initial_block_size=16)
+        charset = Charset.get("0123456789abcdef")
+        sizes = []
+        for _ in range(100):
+            engine.string(4, charset)
+            sizes.append(engine._buffers[charset.chars][2])
+        assert sizes[0] == 32 and sizes[-1] == 256
+        assert sizes == sorted(sizes)
+
+        resumed = StringEngine(Random(), block_size=256)
+        resumed.setstate(engine.getstate())
+        resumed._rng.setstate(engine._rng.getstate())
+        assert [engine.string(7, charset) for _ in range(100)] == [
+            resumed.string(7, charset) for _ in range(100)
+        ]
+
+    def test_charset_eviction(self):
+        engine, ref = StringEngine(Random(42)), StringEngine(Random(42))
+        charsets = [Charset(chr(ord("c") + i)) for i in range(100)]
+        for i in range(200):
+            # More charsets than `Charset.get` caches, so "ab" is rebuilt every time.
+            a = engine.string(3, Charset.get("ab"))
+            engine.string(1, Charset.get(charsets[i % 100].chars))
+            assert a == ref.string(3, Charset("ab"))
+            ref.string(1, charsets[i % 100])
+        assert len(engine._buffers) == 101
+        resumed = StringEngine(Random())
+        resumed.setstate(engine.getstate())
+        resumed._rng.setstate(engine._rng.getstate())
+        assert resumed.string(50, Charset("ab")) == engine.string(50, Charset("ab"))
+
+    def test_uniform(self):
+        engine = StringEngine(Random(42))
+        counts = Counter(engine.string(30000, Charset.get("abc")))
+        assert all(9000 < x < 11000 for x in counts.values())
+
+    def test_reproducible(self):
+        charset = Charset.get("0123456789")
+        a = StringEngine(Random(42))
+        b = StringEngine(Random(42))
+        assert [a.string(8, charset) for _ in range(100)] == [
+            b.string(8, charset) for _ in range(100)
+        ]
+
+    def test_getrandbits_fallback(self):
+        class MyRandom:
+            def getrandbits(self, k):
+                return Random(0).getrandbits(k)
+
+        x = StringEngine(MyRandom()).string(10, Charset.get("ab"))
+        assert len(x) == 10